@@ -0,0 +1,83 @@
+"""Result memoization keyed on the market data date.
+
+Historical results only change when a new daily bar appears, so cached
+entries live until the next US market close and are keyed on the date
+of the last one (the data-as-of date). :class:`ResultCache` is a
+size-bounded LRU with those per-entry expiry times.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Hashable
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    MARKET_TZ = ZoneInfo("America/New_York")
+except ZoneInfoNotFoundError:  # pragma: no cover - no tz database (e.g. Windows)
+    MARKET_TZ = timezone(timedelta(hours=-5))
+
+MARKET_CLOSE_HOUR = 16
+
+
+def last_market_close(now: datetime | None = None) -> datetime:
+    """Most recent weekday 16:00 New York time at or before ``now``.
+
+    Exchange holidays are ignored; on those days the cache simply expires
+    without new data having arrived.
+    """
+    now = (now or datetime.now(timezone.utc)).astimezone(MARKET_TZ)
+    close = now.replace(hour=MARKET_CLOSE_HOUR, minute=0, second=0, microsecond=0)
+    if close > now:
+        close -= timedelta(days=1)
+    while close.weekday() >= 5:
+        close -= timedelta(days=1)
+    return close
+
+
+def next_market_close(now: datetime | None = None) -> datetime:
+    """First weekday 16:00 New York time after ``now``."""
+    close = last_market_close(now) + timedelta(days=1)
+    while close.weekday() >= 5:
+        close += timedelta(days=1)
+    return close
+
+
+def as_of_date(now: datetime | None = None) -> date:
+    """Date of the latest daily bar that can exist at ``now``."""
+    return last_market_close(now).date()
+
+
+class ResultCache:
+    """Thread-safe LRU cache whose entries expire at the next market close."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        """Return the cached value for ``key``, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value) -> None:
+        expires = next_market_close().timestamp()
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,168 @@
+"""Vectorized moving-average crossover engine.
+
+Shared by the ``ma_crossover`` strategy of the API and by the
+``golden_cross_roi.py`` command-line tool, and by the ``/sweep`` window
+grid search. Functions work on plain NumPy arrays along the last axis, so
+the same code evaluates a single price series or a whole stack of window
+combinations at once.
+"""
+import numpy as np
+
+
+def _prefix_sums(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Running sums of the non-NaN values and of how many there were.
+
+    Both start with a zero column so window sums are differences.
+    """
+    valid = ~np.isnan(values)
+    pad = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    csum = np.pad(np.cumsum(np.where(valid, values, 0.0), axis=-1), pad)
+    count = np.pad(np.cumsum(valid, axis=-1), pad)
+    return csum, count
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over ``window`` bars.
+
+    NaN until the window is full and wherever it contains a NaN, like
+    ``Series.rolling(window).mean()``; a gap does not affect later windows.
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[-1]
+    out = np.full(values.shape, np.nan)
+    if window < 1 or window > n:
+        return out
+    csum, count = _prefix_sums(values)
+    total = csum[..., window:] - csum[..., :-window]
+    full = (count[..., window:] - count[..., :-window]) == window
+    out[..., window - 1:] = np.where(full, total / window, np.nan)
+    return out
+
+
+def positions(short_ma: np.ndarray, long_ma: np.ndarray) -> np.ndarray:
+    """Return 1 while invested and 0 while in cash.
+
+    The strategy buys when the short average moves above the long one and
+    sells when it moves below; bars where the averages are equal or not yet
+    defined keep the previous position.
+    """
+    signal = np.sign(np.nan_to_num(short_ma - long_ma))
+    bars = np.arange(signal.shape[-1])
+    last = np.maximum.accumulate(np.where(signal != 0, bars, -1), axis=-1)
+    held = np.take_along_axis(signal, np.maximum(last, 0), axis=-1)
+    return ((last >= 0) & (held > 0)).astype(np.int8)
+
+
+def cross_points(position: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Indices where a 1-D ``position`` switches on (golden) and off (dead)."""
+    change = np.diff(np.asarray(position, dtype=np.int8), prepend=0)
+    return np.flatnonzero(change == 1), np.flatnonzero(change == -1)
+
+
+def pair_trades(buys: np.ndarray, sells: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Pair every buy with the first later sell not used by an earlier pair.
+
+    ``buys`` and ``sells`` are sorted keys (bar indices or dates). Returns
+    the indices into ``buys`` and ``sells`` of the matched pairs; a buy
+    with no sell after it ends the pairing.
+    """
+    buys, sells = np.asarray(buys), np.asarray(sells)
+    first = np.searchsorted(sells, buys, side="right")
+    # Each pair must use a later sell than the pair before it.
+    k = np.arange(len(buys))
+    matched = k + np.maximum.accumulate(first - k) if len(buys) else first
+    valid = matched < len(sells)
+    # Stop at the first buy without a sell, as later ones cannot match.
+    count = int(np.argmin(valid)) if not valid.all() else len(buys)
+    return k[:count], matched[:count]
+
+
+def trade_returns(prices: np.ndarray, buys: np.ndarray, sells: np.ndarray) -> np.ndarray:
+    """Fractional return of each ``(buy, sell)`` bar pair."""
+    prices = np.asarray(prices, dtype=float)
+    return prices[sells] / prices[buys] - 1
+
+
+def final_value(prices: np.ndarray, position: np.ndarray, cash: float) -> np.ndarray:
+    """Value of ``cash`` after trading ``prices`` with ``position``.
+
+    A position held on bar ``t`` earns the move from ``t`` to ``t + 1``;
+    an open position is valued at the last price. Missing prices carry
+    the previous one forward, so a position held across a gap earns the
+    move over the whole gap.
+    """
+    prices = np.asarray(prices, dtype=float)
+    bars = np.arange(prices.shape[-1])
+    last = np.maximum.accumulate(np.where(np.isnan(prices), 0, bars), axis=-1)
+    prices = np.take_along_axis(prices, last, axis=-1)
+    growth = np.nan_to_num(prices[..., 1:] / prices[..., :-1], nan=1.0)
+    return cash * np.prod(np.where(position[..., :-1] == 1, growth, 1.0), axis=-1)
+
+
+def moving_average_crossover(prices: np.ndarray, cash: float, short: int,
+                             long: int) -> dict:
+    """Run the crossover strategy on a single price series.
+
+    Returns the final value, both moving averages, the position series and
+    the completed trades as bar indices with their returns.
+    """
+    prices = np.asarray(prices, dtype=float)
+    short_ma = rolling_mean(prices, short)
+    long_ma = rolling_mean(prices, long)
+    position = positions(short_ma, long_ma)
+    buys, sells = cross_points(position)
+    # Golden and dead crosses alternate, so only a final buy can be unpaired.
+    buys = buys[:len(sells)]
+    return {
+        "final_value": float(final_value(prices, position, cash)),
+        "short_ma": short_ma,
+        "long_ma": long_ma,
+        "position": position,
+        "buys": buys,
+        "sells": sells,
+        "returns": trade_returns(prices, buys, sells),
+    }
+
+
+def rolling_means(values: np.ndarray, windows: np.ndarray) -> np.ndarray:
+    """Trailing means for every window at once as a ``windows x time`` matrix.
+
+    All rows come from a single cumulative sum of ``values``; windows
+    with a NaN, or not yet full, are NaN as in :func:`rolling_mean`.
+    """
+    values = np.asarray(values, dtype=float)
+    windows = np.asarray(windows, dtype=np.int64)
+    n = len(values)
+    csum, count = _prefix_sums(values)
+    end = np.arange(1, n + 1)
+    begin = np.maximum(end - windows[:, None], 0)
+    full = (count[end] - count[begin]) == windows[:, None]
+    return np.where(full, (csum[end] - csum[begin]) / windows[:, None], np.nan)
+
+
+def sweep(prices: np.ndarray, short_windows: np.ndarray, long_windows: np.ndarray,
+          max_cells: int = 1 << 20) -> np.ndarray:
+    """Return the crossover ROI for every short/long window combination.
+
+    The result has one row per short window and one column per long
+    window, with NaN wherever the short window is not shorter than the
+    long one. Combinations are evaluated in chunks of at most
+    ``max_cells`` (combinations x bars) to bound memory.
+    """
+    prices = np.asarray(prices, dtype=float)
+    short_windows = np.asarray(short_windows, dtype=np.int64)
+    long_windows = np.asarray(long_windows, dtype=np.int64)
+    windows, inverse = np.unique(np.concatenate([short_windows, long_windows]),
+                                 return_inverse=True)
+    means = rolling_means(prices, windows)
+    short_rows = inverse[:len(short_windows)]
+    long_rows = inverse[len(short_windows):]
+
+    roi = np.full((len(short_windows), len(long_windows)), np.nan)
+    i, j = np.nonzero(short_windows[:, None] < long_windows[None, :])
+    chunk = max(1, max_cells // max(len(prices), 1))
+    for lo in range(0, len(i), chunk):
+        ci, cj = i[lo:lo + chunk], j[lo:lo + chunk]
+        position = positions(means[short_rows[ci]], means[long_rows[cj]])
+        roi[ci, cj] = final_value(prices, position, 1.0) - 1
+    return roi
@@ -0,0 +1,58 @@
+"""Chart downsampling with Largest-Triangle-Three-Buckets (LTTB).
+
+LTTB keeps the first and last points and, from each of the buckets in
+between, the point forming the largest triangle with the point kept
+before it and the average of the next bucket. That preserves the visual
+shape of a series far better than taking every k-th point. Downsampling
+only changes what is sent to the chart; results are always computed on
+the full series.
+"""
+import numpy as np
+
+
+def lttb(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of ``n_out`` points of ``y`` chosen by LTTB, x being the position."""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out <= 2:
+        return np.array([0, n - 1][:max(n_out, 0)])
+
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(int) + 1
+    edges[-1] = n - 1
+    chosen = np.empty(n_out, dtype=int)
+    chosen[0], chosen[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_lo, next_hi = hi, edges[i + 2]
+            cx, cy = (next_lo + next_hi - 1) / 2, y[next_lo:next_hi].mean()
+        else:
+            cx, cy = n - 1, y[-1]
+        xs = np.arange(lo, hi)
+        area = np.abs((a - cx) * (y[lo:hi] - y[a]) - (a - xs) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        chosen[i + 1] = a
+    return chosen
+
+
+def select(y: np.ndarray, max_points: int, keep: np.ndarray | None = None) -> np.ndarray:
+    """Sorted indices of at most ``max_points`` points to plot from ``y``.
+
+    The endpoints, the minimum and maximum of ``y`` and every index in
+    ``keep`` (such as crossover points) are always included, even if
+    that exceeds ``max_points``; LTTB fills the remaining budget.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    required = [np.array([0, n - 1, np.argmin(y), np.argmax(y)])]
+    if keep is not None:
+        required.append(np.asarray(keep, dtype=int))
+    required = np.unique(np.concatenate(required))
+    # LTTB's own endpoints are already among the required points.
+    budget = max(max_points - len(required) + 2, 2)
+    return np.union1d(lttb(y, budget), required)
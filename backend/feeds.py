@@ -0,0 +1,96 @@
+"""Bar feeds for the live signal WebSocket.
+
+A :class:`BarFeed` provides past bars to warm indicators up and then an
+asynchronous stream of new bars. :class:`PollingFeed` polls a price
+source for newly completed daily bars; :class:`ReplayFeed` replays a CSV
+file and stands in for a live feed in tests and demos.
+"""
+import asyncio
+import csv
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from typing import AsyncIterator, Callable, NamedTuple
+
+import pandas as pd
+
+
+class Bar(NamedTuple):
+    ticker: str
+    date: pd.Timestamp
+    close: float
+
+
+class BarFeed(ABC):
+    """Interface for sources of price bars."""
+
+    def history(self, ticker: str) -> list[Bar]:
+        """Bars to warm indicators up with before streaming starts."""
+        return []
+
+    @abstractmethod
+    def bars(self, tickers: list[str]) -> AsyncIterator[Bar]:
+        """Yield new bars for ``tickers`` as they arrive."""
+        raise NotImplementedError
+
+
+class ReplayFeed(BarFeed):
+    """Replays ``date,ticker,close`` rows from a CSV file in file order."""
+
+    def __init__(self, path: str, delay: float = 0.0):
+        self.path = path
+        self.delay = delay
+
+    async def bars(self, tickers: list[str]) -> AsyncIterator[Bar]:
+        wanted = set(tickers)
+        with open(self.path, newline="") as f:
+            for row in csv.DictReader(f):
+                ticker = row["ticker"].upper()
+                if ticker not in wanted:
+                    continue
+                yield Bar(ticker, pd.Timestamp(row["date"]), float(row["close"]))
+                await asyncio.sleep(self.delay)
+
+
+class PollingFeed(BarFeed):
+    """Polls ``fetch`` for daily bars completed since the last one seen.
+
+    ``fetch`` has the signature of :meth:`PriceBackend.close_prices`.
+    """
+
+    def __init__(self, fetch: Callable[[str, date, date], pd.Series],
+                 interval: float = 300.0, history_days: int = 5 * 365):
+        self.fetch = fetch
+        self.interval = interval
+        self.history_days = history_days
+        self._last: dict[str, pd.Timestamp] = {}
+
+    def _bars_since(self, ticker: str, start: date) -> list[Bar]:
+        closes = self.fetch(ticker, start, date.today())
+        last = self._last.get(ticker)
+        if last is not None:
+            closes = closes[closes.index > last]
+        if not closes.empty:
+            self._last[ticker] = closes.index[-1]
+        return [Bar(ticker, d, float(c)) for d, c in closes.items()]
+
+    def history(self, ticker: str) -> list[Bar]:
+        return self._bars_since(ticker, date.today() - timedelta(days=self.history_days))
+
+    async def bars(self, tickers: list[str]) -> AsyncIterator[Bar]:
+        while True:
+            await asyncio.sleep(self.interval)
+            for ticker in tickers:
+                last = self._last.get(ticker)
+                if last is None:
+                    start = date.today() - timedelta(days=self.history_days)
+                else:
+                    start = last.date() + timedelta(days=1)
+                if start >= date.today():
+                    continue
+                try:
+                    new = await asyncio.to_thread(self._bars_since, ticker, start)
+                except Exception:
+                    # No new bar yet or a failed download; retry next interval.
+                    continue
+                for bar in new:
+                    yield bar
@@ -0,0 +1,56 @@
+"""Concurrent, de-duplicated price fetching.
+
+:class:`TickerFetcher` runs fetches on a bounded thread pool and merges
+identical in-flight requests: when two HTTP requests ask for the same
+ticker and date range at the same time, the second one waits on the
+first one's download instead of starting its own (single-flight).
+"""
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Iterable
+
+import pandas as pd
+
+import metrics
+
+FetchKey = tuple[str, date, date]
+
+
+class TickerFetcher:
+    """Bounded worker pool with single-flight de-duplication."""
+
+    def __init__(self, fetch: Callable[[str, date, date], pd.Series],
+                 max_workers: int = 8):
+        self._fetch = fetch
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="fetch")
+        self._inflight: dict[FetchKey, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, ticker: str, start: date, end: date) -> Future:
+        """Return a future for ``ticker``'s closes, joining any in-flight fetch."""
+        key = (ticker.upper(), start, end)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            # The first requester's context carries its timings into the pool.
+            future = self._pool.submit(
+                contextvars.copy_context().run, self._fetch, ticker, start, end
+            )
+            self._inflight[key] = future
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return future
+
+    def _forget(self, key: FetchKey, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        if metrics.ENABLED and not future.cancelled() and future.exception() is not None:
+            metrics.FETCH_ERRORS.inc()
+
+    def fetch_many(self, tickers: Iterable[str], start: date,
+                   end: date) -> dict[str, Future]:
+        """Start fetching every ticker at once and return their futures."""
+        return {ticker: self.submit(ticker, start, end) for ticker in tickers}
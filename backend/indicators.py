@@ -0,0 +1,95 @@
+"""Incremental moving-average crossover indicators.
+
+Unlike :mod:`crossover`, which evaluates whole price histories at once,
+these classes consume one bar at a time in O(1) and are meant for live
+feeds. Positions follow the same rule as :func:`crossover.positions`:
+buy when the short average moves above the long one, sell when it moves
+below, and hold on ties.
+"""
+from collections import deque
+
+
+class RollingMean:
+    """Trailing mean over ``window`` values, updated in O(1) per value."""
+
+    __slots__ = ("window", "_values", "_sum", "_since_resum")
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("window must be positive")
+        self.window = window
+        self._values: deque[float] = deque(maxlen=window)
+        self._sum = 0.0
+        self._since_resum = 0
+
+    @property
+    def value(self) -> float | None:
+        """Current mean, or None until ``window`` values have been seen."""
+        if len(self._values) < self.window:
+            return None
+        return self._sum / self.window
+
+    def update(self, price: float) -> float | None:
+        if len(self._values) == self.window:
+            self._sum -= self._values[0]
+        self._values.append(price)
+        self._sum += price
+        # Re-add from scratch once per window to stop rounding drift;
+        # this keeps the amortised cost per value constant.
+        self._since_resum += 1
+        if self._since_resum >= self.window:
+            self._sum = sum(self._values)
+            self._since_resum = 0
+        return self.value
+
+
+class IndicatorEngine:
+    """Rolling means per (ticker, window) and crossover positions per pair.
+
+    Each mean is updated once per bar no matter how many crossover pairs
+    use its window.
+    """
+
+    def __init__(self):
+        self._means: dict[str, dict[int, RollingMean]] = {}
+        self._positions: dict[str, dict[tuple[int, int], int]] = {}
+
+    def track(self, ticker: str, short: int, long: int) -> None:
+        """Start following the ``short``/``long`` crossover for ``ticker``."""
+        means = self._means.setdefault(ticker, {})
+        for window in (short, long):
+            means.setdefault(window, RollingMean(window))
+        self._positions.setdefault(ticker, {}).setdefault((short, long), 0)
+
+    def update(self, ticker: str, price: float) -> list[dict]:
+        """Feed one bar and return the new state of every pair on ``ticker``.
+
+        Each state holds both averages, the position and ``event``, which
+        is ``"golden_cross"`` or ``"dead_cross"`` when the position
+        changed on this bar and None otherwise.
+        """
+        means = self._means.get(ticker, {})
+        for mean in means.values():
+            mean.update(price)
+
+        positions = self._positions.get(ticker, {})
+        updates = []
+        for (short, long), position in positions.items():
+            short_ma, long_ma = means[short].value, means[long].value
+            event = None
+            if short_ma is not None and long_ma is not None:
+                if short_ma > long_ma and position == 0:
+                    position, event = 1, "golden_cross"
+                elif short_ma < long_ma and position == 1:
+                    position, event = 0, "dead_cross"
+                positions[(short, long)] = position
+            updates.append({
+                "ticker": ticker,
+                "short_window": short,
+                "long_window": long,
+                "short": short_ma,
+                "long": long_ma,
+                "position": position,
+                "event": event,
+            })
+        return updates
@@ -1,11 +1,64 @@
+import asyncio
+import contextvars
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+import zlib
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
-from fastapi import FastAPI, Depends
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed,
+    TimeoutError as FuturesTimeoutError,
+)
+from functools import partial
+from typing import Callable, Iterator
+from datetime import date, datetime, timedelta, timezone
+from fastapi import FastAPI, Depends, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.routing import Match
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
+import crossover
+import downsample
+import metrics
+import montecarlo
+import portfolio
+import rolling
+import serialization
+import volatility
+from cache import ResultCache, as_of_date
+from feeds import BarFeed, PollingFeed, ReplayFeed
+from fetch import TickerFetcher
+from indicators import IndicatorEngine
+from store import PriceStore
+
+PRICE_STORE_DIR = os.environ.get(
+    "PRICE_STORE_DIR", os.path.join(os.path.dirname(__file__), "data", "prices")
+)
+# Threads used for resampling and strategy math off the event loop.
+CPU_WORKERS = int(os.environ.get("CPU_WORKERS", os.cpu_count() or 1))
+# Seconds to wait for one ticker's prices before reporting it as failed.
+TICKER_TIMEOUT = float(os.environ.get("TICKER_TIMEOUT", 20))
+# Seconds after which a request returns whatever results are ready.
+REQUEST_DEADLINE = float(os.environ.get("REQUEST_DEADLINE", 45))
+# Maximum number of per-ticker results kept in memory.
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", 4096))
+# Upper bound on Monte Carlo paths per ticker.
+MAX_MONTE_CARLO_PATHS = int(os.environ.get("MAX_MONTE_CARLO_PATHS", 1_000_000))
+# Most short or long windows a /sweep grid may have on each axis.
+MAX_SWEEP_WINDOWS = int(os.environ.get("MAX_SWEEP_WINDOWS", 500))
+# Longest price history a request may ask for, in years.
+MAX_HISTORY_YEARS = int(os.environ.get("MAX_HISTORY_YEARS", 50))
+# CSV of date,ticker,close rows to replay on /ws/signals instead of polling.
+SIGNAL_REPLAY_FILE = os.environ.get("SIGNAL_REPLAY_FILE")
+# Seconds between polls for new daily bars on /ws/signals.
+SIGNAL_POLL_INTERVAL = float(os.environ.get("SIGNAL_POLL_INTERVAL", 300))
+
 
 class SimulateRequest(BaseModel):
     tickers: list[str]
@@ -13,10 +66,67 @@ class SimulateRequest(BaseModel):
     strategy: str  # "monthly", "lump_sum", "both", or "ma_crossover"
     short_window: int | None = None
     long_window: int | None = None
+    format: str = "records"  # "records" or "columnar"
+    max_points: int | None = None  # downsample chart series to about this many points
 
 
 class VolatilityRequest(BaseModel):
     tickers: list[str]
+    rolling_window: int | None = None  # days per rolling std point, if wanted
+
+
+class CorrelationRequest(BaseModel):
+    tickers: list[str]
+
+
+class MonteCarloRequest(BaseModel):
+    tickers: list[str]
+    amounts: list[float]
+    paths: int = 10000
+    months: int | None = None  # investment horizon; defaults to the history length
+    method: str = "bootstrap"  # "bootstrap" or "normal"
+    block_months: int = 12  # bootstrap block length
+    seed: int = 0
+
+
+class RollingRequest(BaseModel):
+    tickers: list[str]
+    amounts: list[float]
+    horizon_months: int = 60
+    years: int = 20  # price history to draw start months from
+
+
+class PortfolioRequest(BaseModel):
+    tickers: list[str]
+    weights: list[float] | None = None  # target weights; equal when omitted
+    amount: float = 10000
+    rebalance: str = "none"  # "none", "monthly", "quarterly", "yearly" or "threshold"
+    threshold: float = 0.05  # weight drift that triggers a "threshold" rebalance
+    years: int = 5
+    format: str = "records"  # "records" or "columnar"
+    max_points: int | None = None  # downsample the value series to about this many points
+
+
+class WindowRange(BaseModel):
+    start: int
+    stop: int  # exclusive, as in range()
+    step: int = 1
+
+    def count(self) -> int:
+        """Number of windows, computed without building the list."""
+        return 0 if self.step == 0 else len(range(self.start, self.stop, self.step))
+
+    def values(self) -> list[int]:
+        if self.step == 0:
+            return []
+        return list(range(self.start, self.stop, self.step))
+
+
+class SweepRequest(BaseModel):
+    tickers: list[str]
+    short_windows: WindowRange
+    long_windows: WindowRange
+    interval: str = "monthly"  # "monthly" or "daily"
 
 
 class BaseBackend(ABC):
@@ -30,9 +140,100 @@ class BaseBackend(ABC):
     def volatility(self, data: VolatilityRequest) -> dict:
         raise NotImplementedError
 
+    @abstractmethod
+    def sweep(self, data: SweepRequest) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def correlation(self, data: CorrelationRequest) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def montecarlo(self, data: MonteCarloRequest) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def rolling(self, data: RollingRequest) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def portfolio(self, data: PortfolioRequest) -> dict:
+        raise NotImplementedError
+
+    def simulate_stream(self, data: SimulateRequest,
+                        deadline: float | None = None) -> Iterator[dict]:
+        """Yield per-ticker :meth:`simulate` results as they become available.
+
+        Results may arrive in any order; each one carries its ``ticker``.
+        """
+        yield from self.simulate(data)["results"]
 
-class YFinanceBackend(BaseBackend):
-    """Backend using yfinance for historical price data."""
+    async def simulate_async(self, data: SimulateRequest, executor: Executor | None = None,
+                             ticker_timeout: float | None = None,
+                             deadline: float | None = None) -> dict:
+        """Awaitable :meth:`simulate`; by default the whole call runs on ``executor``."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, contextvars.copy_context().run, self.simulate, data
+        )
+
+    async def volatility_async(self, data: VolatilityRequest, executor: Executor | None = None,
+                               ticker_timeout: float | None = None,
+                               deadline: float | None = None) -> dict:
+        """Awaitable :meth:`volatility`; by default the whole call runs on ``executor``."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, contextvars.copy_context().run, self.volatility, data
+        )
+
+
+def history_window(years: int = 5) -> tuple[date, date]:
+    """Return the ``[start, end)`` date range used for simulations."""
+    end_date = date.today()
+    return end_date - timedelta(days=years * 365), end_date
+
+
+def data_date(now: datetime | None = None) -> date:
+    """Date of the last daily bar a response computed at ``now`` can include.
+
+    Fetches stop before the local date that ends :func:`history_window`,
+    and a bar only exists once its market close has passed, so the data
+    served is bounded by the earlier of the two.
+    """
+    now = now or datetime.now(timezone.utc)
+    fetch_end = now.astimezone().date()
+    return min(fetch_end - timedelta(days=1), as_of_date(now))
+
+
+class PriceBackend(BaseBackend):
+    """Simulation logic shared by backends that provide daily closes.
+
+    All tickers of a request are fetched concurrently through a shared
+    :class:`TickerFetcher`, so latency follows the slowest ticker and
+    identical fetches from concurrent requests are merged. Window sweeps
+    spread their tickers over a process pool created on first use.
+    """
+
+    def __init__(self, max_workers: int = 8, max_processes: int | None = None,
+                 history_years: int = 5):
+        self.fetcher = TickerFetcher(self.close_prices, max_workers=max_workers)
+        self.history_years = history_years
+        self.max_processes = max_processes
+        self._process_pool: ProcessPoolExecutor | None = None
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            # Forking a process that runs fetch threads is unsafe.
+            self._process_pool = ProcessPoolExecutor(
+                self.max_processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._process_pool
+
+    @abstractmethod
+    def close_prices(self, ticker: str, start: date, end: date) -> pd.Series:
+        """Return daily closing prices for ``ticker`` in ``[start, end)``."""
+        raise NotImplementedError
 
     @staticmethod
     def moving_average_crossover(prices: pd.Series, cash: float,
@@ -42,142 +243,749 @@ class YFinanceBackend(BaseBackend):
         Returns final portfolio value along with the short and long
         moving average series used for the strategy.
         """
-        short_ma = prices.rolling(window=short).mean()
-        long_ma = prices.rolling(window=long).mean()
-        position = 0
-        shares = 0.0
-        for date in prices.index:
-            s = short_ma.loc[date]
-            l = long_ma.loc[date]
-            if pd.isna(s) or pd.isna(l):
-                continue
-            price = prices.loc[date]
-            if s > l and position == 0:
-                shares = cash / price
-                cash = 0.0
-                position = 1
-            elif s < l and position == 1:
-                cash = shares * price
-                shares = 0.0
-                position = 0
-        final_price = prices.iloc[-1]
-        final_val = cash + shares * final_price
-        return final_val, short_ma, long_ma
+        result = crossover.moving_average_crossover(
+            prices.to_numpy(), cash, short=short, long=long
+        )
+        short_ma = pd.Series(result["short_ma"], index=prices.index)
+        long_ma = pd.Series(result["long_ma"], index=prices.index)
+        return result["final_value"], short_ma, long_ma
+
+    def simulate_ticker(self, ticker: str, amount: float, close_series: pd.Series,
+                        data: SimulateRequest) -> dict:
+        """Run ``data.strategy`` on one ticker's closes and build its result."""
+        if data.format not in serialization.FORMATS:
+            raise ValueError("Invalid format")
+        if data.max_points is not None and data.max_points < 2:
+            raise ValueError("Invalid max_points")
+        with metrics.stage("resample"):
+            monthly = close_series.resample("MS").first()
+        if monthly.empty:
+            raise ValueError("Monthly resampled data is empty")
+
+        with metrics.stage("strategy"):
+            if data.strategy == "monthly":
+                monthly_investment = amount / len(monthly)
+                shares = (monthly_investment / monthly).sum()
+                final_value = float(shares * monthly.iloc[-1])
+            elif data.strategy == "lump_sum":
+                shares = amount / monthly.iloc[0]
+                final_value = float(shares * monthly.iloc[-1])
+            elif data.strategy == "both":
+                monthly_investment = amount / len(monthly)
+                shares_monthly = (monthly_investment / monthly).sum()
+                shares_lump = amount / monthly.iloc[0]
+                final_monthly = float(shares_monthly * monthly.iloc[-1])
+                final_lump = float(shares_lump * monthly.iloc[-1])
+            elif data.strategy == "ma_crossover":
+                short = data.short_window or 20
+                long = data.long_window or 60
+                final_value, short_ma, long_ma = self.moving_average_crossover(
+                    monthly, amount, short=short, long=long
+                )
+            else:
+                raise ValueError("Invalid strategy")
+
+        with metrics.stage("series"):
+            if data.max_points is not None and len(monthly) > data.max_points:
+                keep = None
+                if data.strategy == "ma_crossover":
+                    position = crossover.positions(short_ma.to_numpy(), long_ma.to_numpy())
+                    keep = np.concatenate(crossover.cross_points(position))
+                shown = downsample.select(monthly.to_numpy(), data.max_points, keep)
+                monthly = monthly.iloc[shown]
+                if data.strategy == "ma_crossover":
+                    short_ma, long_ma = short_ma.iloc[shown], long_ma.iloc[shown]
+            price_data = serialization.price_series(monthly, data.format)
+            if data.strategy == "ma_crossover":
+                ma_data = serialization.ma_series(short_ma, long_ma, data.format)
+
+        if data.strategy == "both":
+            return {
+                "ticker": ticker,
+                "final_values": {
+                    "monthly": round(final_monthly, 2),
+                    "lump_sum": round(final_lump, 2),
+                },
+                "prices": price_data,
+            }
+        if data.strategy == "ma_crossover":
+            return {
+                "ticker": ticker,
+                "final_value": round(final_value, 2),
+                "prices": price_data,
+                "ma_data": ma_data,
+            }
+        return {
+            "ticker": ticker,
+            "final_value": round(final_value, 2),
+            "prices": price_data,
+        }
+
+    @staticmethod
+    def simulate_error(ticker: str, error: Exception) -> dict:
+        return {
+            "ticker": ticker,
+            "final_value": None,
+            "prices": [],
+            "error": str(error),
+        }
 
     def simulate(self, data: SimulateRequest) -> dict:
         results = []
-        end_date = datetime.today()
-        start_date = end_date - timedelta(days=5 * 365)
+        start_date, end_date = history_window(self.history_years)
+        pairs = list(zip(data.tickers, data.amounts))
+        closes = self.fetcher.fetch_many([t for t, _ in pairs], start_date, end_date)
 
-        for ticker, amount in zip(data.tickers, data.amounts):
+        for ticker, amount in pairs:
             try:
-                df = yf.download(ticker, start=start_date, end=end_date, progress=False)
-                if df.empty or "Close" not in df.columns:
-                    raise ValueError("No data received")
+                with metrics.stage("fetch"):
+                    close_series = closes[ticker].result()
+                results.append(self.simulate_ticker(ticker, amount, close_series, data))
+            except Exception as e:
+                results.append(self.simulate_error(ticker, e))
+        return {"results": results}
 
-                df.index = pd.to_datetime(df.index)
+    def simulate_stream(self, data: SimulateRequest,
+                        deadline: float | None = None) -> Iterator[dict]:
+        start_date, end_date = history_window(self.history_years)
+        pairs = list(zip(data.tickers, data.amounts))
+        closes = self.fetcher.fetch_many([t for t, _ in pairs], start_date, end_date)
+        waiting: dict[Future, list[tuple[str, float]]] = {}
+        for ticker, amount in pairs:
+            waiting.setdefault(closes[ticker], []).append((ticker, amount))
 
-                if isinstance(df.columns, pd.MultiIndex):
-                    close_series = df["Close", ticker]
-                else:
-                    close_series = df["Close"]
-
-                monthly = close_series.resample("MS").first()
-                if monthly.empty:
-                    raise ValueError("Monthly resampled data is empty")
-
-                if data.strategy == "monthly":
-                    monthly_investment = amount / len(monthly)
-                    shares = (monthly_investment / monthly).sum()
-                    final_value = float(shares * monthly.iloc[-1])
-                elif data.strategy == "lump_sum":
-                    shares = amount / monthly.iloc[0]
-                    final_value = float(shares * monthly.iloc[-1])
-                elif data.strategy == "both":
-                    monthly_investment = amount / len(monthly)
-                    shares_monthly = (monthly_investment / monthly).sum()
-                    shares_lump = amount / monthly.iloc[0]
-                    final_monthly = float(shares_monthly * monthly.iloc[-1])
-                    final_lump = float(shares_lump * monthly.iloc[-1])
-                elif data.strategy == "ma_crossover":
-                    short = data.short_window or 20
-                    long = data.long_window or 60
-                    final_value, short_ma, long_ma = self.moving_average_crossover(
-                        monthly, amount, short=short, long=long
-                    )
-                    ma_data = [
-                        {
-                            "date": d.strftime("%Y-%m") if hasattr(d, "strftime") else str(d),
-                            "short": None if pd.isna(short_ma.loc[d]) else float(short_ma.loc[d]),
-                            "long": None if pd.isna(long_ma.loc[d]) else float(long_ma.loc[d]),
-                        }
-                        for d in monthly.index
-                    ]
-                else:
-                    raise ValueError("Invalid strategy")
+        try:
+            for future in as_completed(waiting, timeout=deadline):
+                for ticker, amount in waiting.pop(future):
+                    try:
+                        yield self.simulate_ticker(ticker, amount, future.result(), data)
+                    except Exception as e:
+                        yield self.simulate_error(ticker, e)
+        except FuturesTimeoutError:
+            # Not the builtin TimeoutError before Python 3.11.
+            for pending in waiting.values():
+                for ticker, _ in pending:
+                    yield self.simulate_error(ticker, TimeoutError("Request deadline exceeded"))
 
-                price_data = [
-                    {"date": d.strftime("%Y-%m") if hasattr(d, "strftime") else str(d),
-                     "price": float(p)}
-                    for d, p in monthly.items()
-                ]
+    async def _gather(self, jobs: list[tuple[str, Callable[[pd.Series], dict]]],
+                      on_error: Callable[[str, Exception], dict],
+                      executor: Executor | None, ticker_timeout: float | None,
+                      deadline: float | None) -> list[dict]:
+        """Fetch every ticker concurrently and compute each result on ``executor``.
 
-                if data.strategy == "both":
-                    results.append({
-                        "ticker": ticker,
-                        "final_values": {
-                            "monthly": round(final_monthly, 2),
-                            "lump_sum": round(final_lump, 2),
-                        },
-                        "prices": price_data,
-                    })
-                elif data.strategy == "ma_crossover":
-                    results.append({
-                        "ticker": ticker,
-                        "final_value": round(final_value, 2),
-                        "prices": price_data,
-                        "ma_data": ma_data,
-                    })
-                else:
-                    results.append({
-                        "ticker": ticker,
-                        "final_value": round(final_value, 2),
-                        "prices": price_data,
-                    })
+        A ticker whose prices take longer than ``ticker_timeout`` fails on
+        its own, and once ``deadline`` passes the unfinished tickers are
+        reported as failed so the request returns partial results.
+        """
+        loop = asyncio.get_running_loop()
+        start_date, end_date = history_window(self.history_years)
+        closes = self.fetcher.fetch_many([t for t, _ in jobs], start_date, end_date)
+
+        async def run(ticker: str, compute: Callable[[pd.Series], dict]) -> dict:
+            try:
+                # Shielded so a timeout never cancels a fetch other requests share.
+                fetch = asyncio.shield(asyncio.wrap_future(closes[ticker]))
+                try:
+                    with metrics.stage("fetch"):
+                        close_series = await asyncio.wait_for(fetch, ticker_timeout)
+                except asyncio.TimeoutError:
+                    raise TimeoutError("Timed out fetching data") from None
+                return await loop.run_in_executor(
+                    executor, contextvars.copy_context().run, compute, close_series
+                )
             except Exception as e:
-                results.append({
-                    "ticker": ticker,
-                    "final_value": None,
-                    "prices": [],
-                    "error": str(e),
-                })
+                return on_error(ticker, e)
+
+        tasks = [asyncio.create_task(run(ticker, compute)) for ticker, compute in jobs]
+        if not tasks:
+            return []
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        return [
+            on_error(ticker, TimeoutError("Request deadline exceeded"))
+            if task in pending else task.result()
+            for task, (ticker, _) in zip(tasks, jobs)
+        ]
+
+    async def simulate_async(self, data: SimulateRequest, executor: Executor | None = None,
+                             ticker_timeout: float | None = None,
+                             deadline: float | None = None) -> dict:
+        jobs = [
+            (ticker, partial(self.simulate_ticker, ticker, amount, data=data))
+            for ticker, amount in zip(data.tickers, data.amounts)
+        ]
+        results = await self._gather(jobs, self.simulate_error, executor,
+                                     ticker_timeout, deadline)
         return {"results": results}
 
+    @staticmethod
+    def volatility_error(ticker: str, error: Exception) -> dict:
+        return {"ticker": ticker, "error": str(error)}
+
+    def volatility_results(self, data: VolatilityRequest,
+                           closes: dict[str, pd.Series | Exception]) -> list[dict]:
+        """Summarise the daily return distribution of every ticker at once.
+
+        ``closes`` maps each ticker to its prices or to the error raised
+        while fetching them. All series are aligned into one matrix so the
+        statistics take a single vectorized pass over all tickers.
+        """
+        if data.rolling_window is not None and data.rolling_window < 2:
+            return [self.volatility_error(t, ValueError("Invalid rolling_window"))
+                    for t in data.tickers]
+        series = {}
+        for ticker, value in closes.items():
+            if isinstance(value, pd.Series) and len(value) > 2:
+                series[ticker] = value
+            elif not isinstance(value, Exception):
+                closes[ticker] = ValueError("Not enough data")
+
+        with metrics.stage("volatility"):
+            dates, matrix = volatility.align(series)
+            returns = volatility.daily_returns(matrix)
+            stats = volatility.box_stats(returns) if series else {}
+            if data.rolling_window is not None and series:
+                rolling = volatility.rolling_std(returns, data.rolling_window)
+            day_labels = dates.strftime("%Y-%m-%d")
+
+        columns = {ticker: j for j, ticker in enumerate(series)}
+        results = []
+        for ticker in data.tickers:
+            j = columns.get(ticker)
+            if j is None:
+                results.append(self.volatility_error(ticker, closes[ticker]))
+                continue
+            result = {"ticker": ticker}
+            result.update({name: float(values[j]) for name, values in stats.items()})
+            if data.rolling_window is not None:
+                present = np.flatnonzero(~np.isnan(rolling[:, j]))
+                result["rolling_std"] = [
+                    {"date": day_labels[i], "std": float(rolling[i, j])} for i in present
+                ]
+            results.append(result)
+        return results
+
+    def _fetch_all(self, tickers: list[str],
+                   years: int | None = None) -> dict[str, pd.Series | Exception]:
+        start_date, end_date = history_window(years or self.history_years)
+        futures = self.fetcher.fetch_many(tickers, start_date, end_date)
+        closes = {}
+        for ticker in tickers:
+            try:
+                with metrics.stage("fetch"):
+                    closes[ticker] = futures[ticker].result()
+            except Exception as e:
+                closes[ticker] = e
+        return closes
+
     def volatility(self, data: VolatilityRequest) -> dict:
-        end_date = datetime.today()
-        start_date = end_date - timedelta(days=5 * 365)
+        return {"results": self.volatility_results(data, self._fetch_all(data.tickers))}
+
+    async def volatility_async(self, data: VolatilityRequest, executor: Executor | None = None,
+                               ticker_timeout: float | None = None,
+                               deadline: float | None = None) -> dict:
+        # Only the fetches run per ticker; the statistics are one pass.
+        jobs = [(ticker, lambda prices: prices) for ticker in data.tickers]
+        fetched = await self._gather(jobs, lambda ticker, e: e, executor,
+                                     ticker_timeout, deadline)
+        closes = dict(zip(data.tickers, fetched))
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            executor, contextvars.copy_context().run, self.volatility_results, data, closes
+        )
+        return {"results": results}
+
+    def correlation(self, data: CorrelationRequest) -> dict:
+        """Covariance and correlation matrices of daily returns.
+
+        Each pair of tickers is compared over the days both have prices.
+        Tickers that fail to load are listed under ``errors`` and left out
+        of the matrices.
+        """
+        closes = self._fetch_all(data.tickers)
+        series = {t: c for t, c in closes.items()
+                  if isinstance(c, pd.Series) and len(c) > 2}
+        errors = [
+            self.volatility_error(t, c if isinstance(c, Exception) else ValueError("Not enough data"))
+            for t, c in closes.items() if t not in series
+        ]
+        with metrics.stage("correlation"):
+            _, matrix = volatility.align(series)
+            cov, corr = volatility.covariance(volatility.daily_returns(matrix))
+
+        def rows(m: np.ndarray) -> list[list[float | None]]:
+            return [[None if np.isnan(v) else float(v) for v in row] for row in m]
+
+        return {
+            "tickers": list(series),
+            "covariance": rows(cov),
+            "correlation": rows(corr),
+            "errors": errors,
+        }
+
+    def montecarlo_ticker(self, ticker: str, amount: float, close_series: pd.Series,
+                          data: MonteCarloRequest) -> dict:
+        """Compare monthly and lump-sum investing over simulated paths."""
+        if not 0 < data.paths <= MAX_MONTE_CARLO_PATHS:
+            raise ValueError(f"paths must be between 1 and {MAX_MONTE_CARLO_PATHS}")
+        with metrics.stage("resample"):
+            monthly = close_series.resample("MS").first().dropna()
+        log_returns = np.diff(np.log(monthly.to_numpy(dtype=float)))
+        # A block covering the whole history would replay it on every path.
+        if not 1 <= data.block_months < len(log_returns):
+            raise ValueError("Invalid block_months")
+        months = data.months or len(monthly)
+        if not 2 <= months <= MAX_HISTORY_YEARS * 12:
+            raise ValueError(f"months must be between 2 and {MAX_HISTORY_YEARS * 12}")
+
+        with metrics.stage("montecarlo"):
+            # Seeded per ticker so a result does not depend on its neighbours.
+            seed = [data.seed, zlib.crc32(ticker.upper().encode())]
+            outcome = montecarlo.simulate(
+                log_returns, amount, data.paths, months - 1, data.method,
+                data.block_months, seed, executor=self.process_pool,
+            )
+            dca, lump = montecarlo.final_values(log_returns[None, :], amount)
+        return {
+            "ticker": ticker,
+            "historical": {"monthly": round(float(dca[0]), 2),
+                           "lump_sum": round(float(lump[0]), 2)},
+            "percentiles": outcome["percentiles"],
+            "monthly": [round(v, 2) for v in outcome["monthly"]],
+            "lump_sum": [round(v, 2) for v in outcome["lump_sum"]],
+            "mean": {k: round(v, 2) for k, v in outcome["mean"].items()},
+            "prob_monthly_beats_lump_sum": outcome["prob_monthly_beats_lump_sum"],
+        }
+
+    def montecarlo(self, data: MonteCarloRequest) -> dict:
+        closes = self._fetch_all(data.tickers)
+        results = []
+        for ticker, amount in zip(data.tickers, data.amounts):
+            try:
+                if isinstance(closes[ticker], Exception):
+                    raise closes[ticker]
+                results.append(self.montecarlo_ticker(ticker, amount, closes[ticker], data))
+            except Exception as e:
+                results.append({"ticker": ticker, "error": str(e)})
+        return {"results": results}
+
+    @staticmethod
+    def rolling_ticker(ticker: str, amount: float, close_series: pd.Series,
+                       data: RollingRequest) -> dict:
+        """Monthly vs lump-sum outcomes for every start month of the history."""
+        with metrics.stage("resample"):
+            monthly = close_series.resample("MS").first().dropna()
+        with metrics.stage("rolling"):
+            dca, lump = rolling.start_dates(
+                monthly.to_numpy(dtype=float), data.horizon_months, amount
+            )
+            summary = {
+                "percentiles": list(montecarlo.PERCENTILES),
+                "monthly": np.percentile(dca, montecarlo.PERCENTILES).round(2).tolist(),
+                "lump_sum": np.percentile(lump, montecarlo.PERCENTILES).round(2).tolist(),
+                "prob_monthly_beats_lump_sum": float(np.mean(dca > lump)),
+            }
+        with metrics.stage("series"):
+            starts = [
+                {"date": d.strftime("%Y-%m"), "monthly": m, "lump_sum": l}
+                for d, m, l in zip(monthly.index, dca.round(2).tolist(), lump.round(2).tolist())
+            ]
+        return {
+            "ticker": ticker,
+            "horizon_months": data.horizon_months,
+            "starts": starts,
+            "summary": summary,
+        }
+
+    def rolling(self, data: RollingRequest) -> dict:
+        if not 0 < data.years <= MAX_HISTORY_YEARS:
+            error = ValueError(f"years must be between 1 and {MAX_HISTORY_YEARS}")
+            return {"results": [{"ticker": t, "error": str(error)} for t in data.tickers]}
+        if data.horizon_months < 1:
+            error = ValueError("Invalid horizon_months")
+            return {"results": [{"ticker": t, "error": str(error)} for t in data.tickers]}
+        closes = self._fetch_all(data.tickers, data.years)
+        results = []
+        for ticker, amount in zip(data.tickers, data.amounts):
+            try:
+                if isinstance(closes[ticker], Exception):
+                    raise closes[ticker]
+                results.append(self.rolling_ticker(ticker, amount, closes[ticker], data))
+            except Exception as e:
+                results.append({"ticker": ticker, "error": str(e)})
+        return {"results": results}
+
+    def portfolio(self, data: PortfolioRequest) -> dict:
+        """Backtest one portfolio of all tickers with target weights.
+
+        Daily closes are aligned into one matrix, with gaps filled by the
+        last close, starting on the first day every ticker has a price.
+        """
+        try:
+            if len(set(t.upper() for t in data.tickers)) != len(data.tickers):
+                raise ValueError("Duplicate tickers")
+            weights = np.asarray(data.weights or [1.0] * len(data.tickers), dtype=float)
+            if len(weights) != len(data.tickers) or (weights < 0).any() or weights.sum() <= 0:
+                raise ValueError("Invalid weights")
+            if data.rebalance not in portfolio.REBALANCE:
+                raise ValueError("Invalid rebalance")
+            if data.rebalance == "threshold" and not 0 < data.threshold < 1:
+                raise ValueError("Invalid threshold")
+            if data.format not in serialization.FORMATS:
+                raise ValueError("Invalid format")
+            if data.max_points is not None and data.max_points < 2:
+                raise ValueError("Invalid max_points")
+            if not 0 < data.years <= MAX_HISTORY_YEARS:
+                raise ValueError(f"years must be between 1 and {MAX_HISTORY_YEARS}")
+        except ValueError as e:
+            return {"error": str(e), "errors": []}
+        weights = weights / weights.sum()
+
+        closes = self._fetch_all(data.tickers, data.years)
+        errors = [{"ticker": t, "error": str(c)}
+                  for t, c in closes.items() if isinstance(c, Exception)]
+        if errors:
+            return {"error": "Missing prices for " + ", ".join(e["ticker"] for e in errors),
+                    "errors": errors}
+
+        with metrics.stage("align"):
+            frame = pd.DataFrame(closes).ffill().dropna()
+        if len(frame) < 2:
+            return {"error": "Not enough overlapping data", "errors": []}
+        prices = frame.to_numpy(dtype=float)
+
+        with metrics.stage("portfolio"):
+            if data.rebalance == "none":
+                starts = np.array([], dtype=int)
+            elif data.rebalance == "threshold":
+                starts = portfolio.threshold_starts(prices, weights, data.threshold)
+            else:
+                starts = portfolio.period_starts(frame.index, data.rebalance)
+            result = portfolio.backtest(prices, weights, data.amount, starts)
+            stats = portfolio.summary(result["value"], frame.index)
+            final_held = result["shares"][-1] * prices[-1]
+
+        with metrics.stage("series"):
+            value = pd.Series(result["value"], index=frame.index).resample("MS").first()
+            if data.max_points is not None and len(value) > data.max_points:
+                value = value.iloc[downsample.select(value.to_numpy(), data.max_points)]
+            values = serialization.price_series(value, data.format)
+        return {
+            "start_date": frame.index[0].strftime("%Y-%m-%d"),
+            "final_value": round(float(result["value"][-1]), 2),
+            **{k: round(v, 6) for k, v in stats.items()},
+            "rebalances": len(result["rebalances"]),
+            "turnover": round(float(result["turnover"].sum()), 2),
+            "assets": [
+                {"ticker": t, "target_weight": round(float(w), 6),
+                 "final_weight": round(float(h / final_held.sum()), 6), "shares": float(n)}
+                for t, w, h, n in zip(data.tickers, weights, final_held, result["shares"][-1])
+            ],
+            "values": values,
+        }
+
+    def sweep(self, data: SweepRequest) -> dict:
+        """Crossover ROI (%) heatmap over a grid of short/long windows."""
+        if max(data.short_windows.count(), data.long_windows.count()) > MAX_SWEEP_WINDOWS:
+            error = ValueError(f"At most {MAX_SWEEP_WINDOWS} windows per axis")
+            return {"results": [{"ticker": t, "error": str(error)} for t in data.tickers]}
+        start_date, end_date = history_window(self.history_years)
+        shorts = data.short_windows.values()
+        longs = data.long_windows.values()
+        closes = self.fetcher.fetch_many(data.tickers, start_date, end_date)
+
+        jobs = {}
+        for ticker in data.tickers:
+            try:
+                if data.interval not in ("monthly", "daily"):
+                    raise ValueError("Invalid interval")
+                if not shorts or not longs or min(shorts + longs) < 1:
+                    raise ValueError("Invalid windows")
+                with metrics.stage("fetch"):
+                    prices = closes[ticker].result()
+                if data.interval == "monthly":
+                    prices = prices.resample("MS").first()
+                if max(shorts + longs) > len(prices):
+                    raise ValueError("Windows longer than the price history")
+                # A lone ticker is not worth the round trip to a worker.
+                if len(data.tickers) > 1:
+                    jobs[ticker] = self.process_pool.submit(
+                        crossover.sweep, prices.to_numpy(), shorts, longs
+                    )
+                else:
+                    with metrics.stage("sweep"):
+                        jobs[ticker] = crossover.sweep(prices.to_numpy(), shorts, longs)
+            except Exception as e:
+                jobs[ticker] = e
+
         results = []
         for ticker in data.tickers:
             try:
-                df = yf.download(ticker, start=start_date, end=end_date, progress=False)
-                if df.empty or "Close" not in df.columns:
-                    raise ValueError("No data received")
-                df["returns"] = df["Close"].pct_change().dropna()
-                returns = df["returns"].dropna()
-                summary = {
-                    "min": float(returns.min()),
-                    "q1": float(returns.quantile(0.25)),
-                    "median": float(returns.median()),
-                    "q3": float(returns.quantile(0.75)),
-                    "max": float(returns.max()),
-                    "std": float(returns.std()),
-                }
-                results.append({"ticker": ticker, **summary})
+                job = jobs[ticker]
+                if isinstance(job, Exception):
+                    raise job
+                with metrics.stage("sweep"):
+                    roi = job.result() if isinstance(job, Future) else job
+                results.append({
+                    "ticker": ticker,
+                    "short_windows": shorts,
+                    "long_windows": longs,
+                    "roi": [
+                        [None if np.isnan(r) else round(float(r) * 100, 2) for r in row]
+                        for row in roi
+                    ],
+                })
             except Exception as e:
                 results.append({"ticker": ticker, "error": str(e)})
         return {"results": results}
 
 
+class YFinanceBackend(PriceBackend):
+    """Backend using yfinance for historical price data.
+
+    When a :class:`PriceStore` is given, closes are served from it and only
+    the bars missing since the last stored one are downloaded.
+    """
+
+    def __init__(self, store: PriceStore | None = None, max_workers: int = 8):
+        super().__init__(max_workers=max_workers)
+        self.store = store
+
+    @staticmethod
+    def download(ticker: str, start: date, end: date) -> pd.Series:
+        # ``yf.download`` keeps its results in module-global state, so
+        # concurrent calls from the fetch pool would clobber each other.
+        with metrics.stage("download"):
+            df = yf.Ticker(ticker).history(start=start, end=end, auto_adjust=True)
+        if df.empty or "Close" not in df.columns:
+            return pd.Series(dtype=float, name=ticker)
+
+        df.index = pd.to_datetime(df.index).tz_localize(None)
+        return df["Close"].rename(ticker)
+
+    def close_prices(self, ticker: str, start: date, end: date) -> pd.Series:
+        if self.store is None:
+            closes = self.download(ticker, start, end)
+        else:
+            closes = self.store.refresh(ticker, start, end, self.download)
+        if closes.empty:
+            raise ValueError("No data received")
+        return closes
+
+
+class StoreBackend(PriceBackend):
+    """Offline backend serving prices from a :class:`PriceStore` only."""
+
+    def __init__(self, store: PriceStore, max_workers: int = 8):
+        super().__init__(max_workers=max_workers)
+        self.store = store
+
+    def close_prices(self, ticker: str, start: date, end: date) -> pd.Series:
+        with metrics.stage("store"):
+            closes = self.store.load(ticker, start, end)
+        if closes.empty:
+            raise ValueError("No stored data")
+        return closes
+
+
+class SyntheticBackend(PriceBackend):
+    """Deterministic offline backend generating geometric Brownian motion.
+
+    Each ticker's path is seeded from ``seed`` and the ticker name, so the
+    same request always yields the same prices. Used for benchmarks and
+    tests that must not depend on the network.
+    """
+
+    def __init__(self, seed: int = 0, drift: float = 0.07, sigma: float = 0.25,
+                 max_workers: int = 8, history_years: int = 5):
+        super().__init__(max_workers=max_workers, history_years=history_years)
+        self.seed = seed
+        self.drift = drift
+        self.sigma = sigma
+
+    def close_prices(self, ticker: str, start: date, end: date) -> pd.Series:
+        # np.is_busday is far cheaper than pd.bdate_range, which would
+        # otherwise dominate benchmark timings.
+        days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D"))
+        dates = pd.DatetimeIndex(days[np.is_busday(days)].astype("datetime64[ns]"))
+        rng = np.random.default_rng([self.seed, zlib.crc32(ticker.upper().encode())])
+        dt = 1 / 252
+        log_returns = rng.normal(
+            (self.drift - self.sigma ** 2 / 2) * dt,
+            self.sigma * np.sqrt(dt),
+            len(dates),
+        )
+        return pd.Series(100 * np.exp(np.cumsum(log_returns)), index=dates, name=ticker)
+
+
+class CachedBackend(BaseBackend):
+    """Memoizes per-ticker results of another backend.
+
+    Entries are keyed on the ticker, the request parameters and the date
+    of the last bar the data can include (:func:`data_date`), and expire
+    at the next market close. Only tickers missing from the cache are
+    passed on to the wrapped backend; failed tickers are never cached.
+    """
+
+    def __init__(self, backend: BaseBackend, cache: ResultCache | None = None):
+        self.backend = backend
+        self.cache = cache or ResultCache(RESULT_CACHE_SIZE)
+
+    @staticmethod
+    def _key(kind: str, ticker: str, data: BaseModel, exclude: set[str]) -> tuple:
+        params = json.dumps(data.model_dump(exclude=exclude), sort_keys=True)
+        return kind, ticker.upper(), params, data_date()
+
+    def _simulate_keys(self, data: SimulateRequest) -> list[tuple]:
+        return [
+            self._key("simulate", ticker, data, {"tickers", "amounts"}) + (amount,)
+            for ticker, amount in zip(data.tickers, data.amounts)
+        ]
+
+    def _lookup(self, keys: list[tuple]) -> tuple[list[dict | None], list[int]]:
+        results = [self.cache.get(key) for key in keys]
+        missing = [i for i, r in enumerate(results) if r is None]
+        if metrics.ENABLED:
+            metrics.CACHE_LOOKUPS.inc(("hit",), len(keys) - len(missing))
+            metrics.CACHE_LOOKUPS.inc(("miss",), len(missing))
+        return results, missing
+
+    def _store(self, keys: list[tuple], results: list[dict | None],
+               missing: list[int], fresh: list[dict]) -> list[dict]:
+        for i, result in zip(missing, fresh):
+            results[i] = result
+            if "error" not in result:
+                self.cache.put(keys[i], result)
+        return results
+
+    @staticmethod
+    def _subset(data: BaseModel, missing: list[int]) -> BaseModel:
+        return data.model_copy(update={
+            "tickers": [data.tickers[i] for i in missing],
+            "amounts": [data.amounts[i] for i in missing],
+        })
+
+    def simulate(self, data: SimulateRequest) -> dict:
+        keys = self._simulate_keys(data)
+        results, missing = self._lookup(keys)
+        fresh = []
+        if missing:
+            fresh = self.backend.simulate(self._subset(data, missing))["results"]
+        return {"results": self._store(keys, results, missing, fresh)}
+
+    async def simulate_async(self, data: SimulateRequest, executor: Executor | None = None,
+                             ticker_timeout: float | None = None,
+                             deadline: float | None = None) -> dict:
+        keys = self._simulate_keys(data)
+        results, missing = self._lookup(keys)
+        fresh = []
+        if missing:
+            fresh = (await self.backend.simulate_async(
+                self._subset(data, missing), executor, ticker_timeout, deadline
+            ))["results"]
+        return {"results": self._store(keys, results, missing, fresh)}
+
+    def simulate_stream(self, data: SimulateRequest,
+                        deadline: float | None = None) -> Iterator[dict]:
+        keys = self._simulate_keys(data)
+        results, missing = self._lookup(keys)
+        yield from (r for r in results if r is not None)
+        if not missing:
+            return
+        # Streamed results come back in any order, so match them by ticker.
+        pending: dict[str, list[int]] = {}
+        for i in missing:
+            pending.setdefault(data.tickers[i], []).append(i)
+        for result in self.backend.simulate_stream(self._subset(data, missing), deadline):
+            i = pending[result["ticker"]].pop(0)
+            self._store(keys, results, [i], [result])
+            yield result
+
+    def _volatility_keys(self, data: VolatilityRequest) -> list[tuple]:
+        return [self._key("volatility", t, data, {"tickers"}) for t in data.tickers]
+
+    def volatility(self, data: VolatilityRequest) -> dict:
+        keys = self._volatility_keys(data)
+        results, missing = self._lookup(keys)
+        fresh = []
+        if missing:
+            subset = data.model_copy(update={"tickers": [data.tickers[i] for i in missing]})
+            fresh = self.backend.volatility(subset)["results"]
+        return {"results": self._store(keys, results, missing, fresh)}
+
+    async def volatility_async(self, data: VolatilityRequest, executor: Executor | None = None,
+                               ticker_timeout: float | None = None,
+                               deadline: float | None = None) -> dict:
+        keys = self._volatility_keys(data)
+        results, missing = self._lookup(keys)
+        fresh = []
+        if missing:
+            subset = data.model_copy(update={"tickers": [data.tickers[i] for i in missing]})
+            fresh = (await self.backend.volatility_async(
+                subset, executor, ticker_timeout, deadline
+            ))["results"]
+        return {"results": self._store(keys, results, missing, fresh)}
+
+    def sweep(self, data: SweepRequest) -> dict:
+        return self.backend.sweep(data)
+
+    def correlation(self, data: CorrelationRequest) -> dict:
+        return self.backend.correlation(data)
+
+    def _per_amount(self, kind: str, data: BaseModel,
+                    compute: Callable[[BaseModel], dict]) -> dict:
+        """Cached results of a request with parallel ``tickers`` and ``amounts``."""
+        keys = [
+            self._key(kind, ticker, data, {"tickers", "amounts"}) + (amount,)
+            for ticker, amount in zip(data.tickers, data.amounts)
+        ]
+        results, missing = self._lookup(keys)
+        fresh = []
+        if missing:
+            fresh = compute(self._subset(data, missing))["results"]
+        return {"results": self._store(keys, results, missing, fresh)}
+
+    def montecarlo(self, data: MonteCarloRequest) -> dict:
+        return self._per_amount("montecarlo", data, self.backend.montecarlo)
+
+    def rolling(self, data: RollingRequest) -> dict:
+        return self._per_amount("rolling", data, self.backend.rolling)
+
+    def portfolio(self, data: PortfolioRequest) -> dict:
+        return self.backend.portfolio(data)
+
+
+def request_etag(data: BaseModel, request: Request) -> str:
+    """Validator for a request's response, derived without computing it.
+
+    Responses depend only on the request, the negotiated media type and
+    the date of the last bar they can include, so the ETag changes once
+    per trading day.
+    """
+    digest = hashlib.sha1(data.model_dump_json().encode())
+    digest.update(request.headers.get("accept", "").encode())
+    digest.update(data_date().isoformat().encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """Whether the client's ``If-None-Match`` already covers ``etag``."""
+    tags = [t.strip() for t in request.headers.get("if-none-match", "").split(",")]
+    return "*" in tags or etag in tags or etag.removeprefix("W/") in tags
+
+
+def cacheable(payload: dict) -> bool:
+    """Whether ``payload`` may carry an ETag.
+
+    Failures such as timeouts are retried on the next request, so a
+    response containing any error must not be revalidated as current.
+    """
+    if payload.get("error") or payload.get("errors"):
+        return False
+    return not any("error" in r for r in payload.get("results", []))
+
+
 app = FastAPI()
 
 app.add_middleware(
@@ -188,21 +996,239 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-backend_service: BaseBackend = YFinanceBackend()
+def route_label(request: Request) -> str:
+    """The path template of the route serving ``request``.
+
+    Labelling metrics with raw paths would let arbitrary URLs create
+    unbounded numbers of series.
+    """
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match != Match.NONE:
+            return route.path
+    return "unmatched"
+
+
+if metrics.ENABLED:
+    @app.middleware("http")
+    async def record_timing(request: Request, call_next):
+        """Time the request and report its stages in ``Server-Timing``."""
+        if request.url.path == "/metrics":
+            return await call_next(request)
+        began = time.perf_counter()
+        timer, token = metrics.start_request(route_label(request))
+        try:
+            response = await call_next(request)
+        finally:
+            server_timing = metrics.finish_request(timer, token, time.perf_counter() - began)
+        response.headers["Server-Timing"] = server_timing
+        return response
+
+price_backend = YFinanceBackend(store=PriceStore(PRICE_STORE_DIR))
+backend_service: BaseBackend = CachedBackend(price_backend)
+cpu_executor = ThreadPoolExecutor(CPU_WORKERS, thread_name_prefix="cpu")
 
 def get_backend() -> BaseBackend:
     return backend_service
 
 
+def get_feed() -> BarFeed:
+    if SIGNAL_REPLAY_FILE:
+        return ReplayFeed(SIGNAL_REPLAY_FILE)
+    return PollingFeed(price_backend.close_prices, interval=SIGNAL_POLL_INTERVAL)
+
+
+def serialize(payload: dict, request: Request) -> Response:
+    with metrics.stage("serialize"):
+        return serialization.respond(payload, request)
+
+
 @app.post("/simulate")
-def simulate_endpoint(
-    data: SimulateRequest, backend: BaseBackend = Depends(get_backend)
+async def simulate_endpoint(
+    data: SimulateRequest, request: Request,
+    backend: BaseBackend = Depends(get_backend),
 ):
-    return backend.simulate(data)
+    metrics.label(strategy=data.strategy)
+    etag = request_etag(data, request)
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    if serialization.wants_arrow(request):
+        data = data.model_copy(update={"format": "columnar"})
+    payload = await backend.simulate_async(
+        data, cpu_executor, TICKER_TIMEOUT, REQUEST_DEADLINE
+    )
+    metrics.count_results("simulate", payload["results"])
+    loop = asyncio.get_running_loop()
+    response = await loop.run_in_executor(
+        cpu_executor, contextvars.copy_context().run, serialize, payload, request
+    )
+    if cacheable(payload):
+        response.headers["ETag"] = etag
+    return response
+
+
+@app.post("/simulate/stream")
+def simulate_stream_endpoint(
+    data: SimulateRequest, request: Request,
+    backend: BaseBackend = Depends(get_backend),
+):
+    """Stream one result per ticker as NDJSON, or as SSE when asked for."""
+    metrics.label(strategy=data.strategy)
+
+    def results():
+        for result in backend.simulate_stream(data, REQUEST_DEADLINE):
+            metrics.count_results("simulate_stream", [result])
+            yield result
+
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            (b"data: " + serialization.dumps(r) + b"\n\n" for r in results()),
+            media_type="text/event-stream",
+        )
+    return StreamingResponse(
+        (serialization.dumps(r) + b"\n" for r in results()),
+        media_type="application/x-ndjson",
+    )
 
 
 @app.post("/volatility")
-def volatility_endpoint(
-    data: VolatilityRequest, backend: BaseBackend = Depends(get_backend)
+async def volatility_endpoint(
+    data: VolatilityRequest, request: Request, response: Response,
+    backend: BaseBackend = Depends(get_backend),
+):
+    etag = request_etag(data, request)
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    payload = await backend.volatility_async(
+        data, cpu_executor, TICKER_TIMEOUT, REQUEST_DEADLINE
+    )
+    metrics.count_results("volatility", payload["results"])
+    if cacheable(payload):
+        response.headers["ETag"] = etag
+    return payload
+
+
+@app.post("/correlation")
+def correlation_endpoint(
+    data: CorrelationRequest, request: Request, response: Response,
+    backend: BaseBackend = Depends(get_backend),
 ):
-    return backend.volatility(data)
+    etag = request_etag(data, request)
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    payload = backend.correlation(data)
+    if cacheable(payload):
+        response.headers["ETag"] = etag
+    return payload
+
+
+@app.post("/montecarlo")
+def montecarlo_endpoint(
+    data: MonteCarloRequest, request: Request, response: Response,
+    backend: BaseBackend = Depends(get_backend),
+):
+    """Percentile bands of monthly vs lump-sum outcomes over simulated paths."""
+    metrics.label(strategy=data.method)
+    etag = request_etag(data, request)
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    payload = backend.montecarlo(data)
+    metrics.count_results("montecarlo", payload["results"])
+    if cacheable(payload):
+        response.headers["ETag"] = etag
+    return payload
+
+
+@app.post("/rolling")
+def rolling_endpoint(
+    data: RollingRequest, request: Request, response: Response,
+    backend: BaseBackend = Depends(get_backend),
+):
+    """Monthly vs lump-sum outcomes for every start month of the history."""
+    etag = request_etag(data, request)
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    payload = backend.rolling(data)
+    metrics.count_results("rolling", payload["results"])
+    if cacheable(payload):
+        response.headers["ETag"] = etag
+    return payload
+
+
+@app.post("/portfolio")
+async def portfolio_endpoint(
+    data: PortfolioRequest, request: Request,
+    backend: BaseBackend = Depends(get_backend),
+):
+    """Backtest a weighted portfolio of all tickers with optional rebalancing."""
+    metrics.label(strategy=data.rebalance)
+    etag = request_etag(data, request)
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    loop = asyncio.get_running_loop()
+    payload = await loop.run_in_executor(
+        cpu_executor, contextvars.copy_context().run, backend.portfolio, data
+    )
+    response = serialize(payload, request)
+    if cacheable(payload):
+        response.headers["ETag"] = etag
+    return response
+
+
+@app.post("/sweep")
+def sweep_endpoint(
+    data: SweepRequest, backend: BaseBackend = Depends(get_backend)
+):
+    payload = backend.sweep(data)
+    metrics.count_results("sweep", payload["results"])
+    return payload
+
+
+@app.websocket("/ws/signals")
+async def signals_endpoint(
+    websocket: WebSocket, tickers: str, short: int = 20, long: int = 60,
+    feed: BarFeed = Depends(get_feed),
+):
+    """Push moving averages and crossover events as new daily bars arrive.
+
+    Each ticker is first warmed up on its history and reported in one
+    ``snapshot`` message; after that every new bar is sent as a ``bar``
+    message whose ``event`` names any crossover it triggered.
+    """
+    await websocket.accept()
+    names = [t.strip().upper() for t in tickers.split(",") if t.strip()]
+    if not names or not 0 < short < long:
+        await websocket.close(code=1008, reason="Invalid tickers or windows")
+        return
+
+    engine = IndicatorEngine()
+    snapshot = []
+    for ticker in names:
+        engine.track(ticker, short, long)
+        try:
+            history = await asyncio.to_thread(feed.history, ticker)
+        except Exception as e:
+            snapshot.append({"ticker": ticker, "error": str(e)})
+            continue
+        state = None
+        for bar in history:
+            state = engine.update(ticker, bar.close)[0]
+        if state is not None:
+            snapshot.append({**state, "date": history[-1].date.date().isoformat(),
+                             "close": history[-1].close})
+    try:
+        await websocket.send_json({"type": "snapshot", "results": snapshot})
+        async for bar in feed.bars(names):
+            for state in engine.update(bar.ticker, bar.close):
+                await websocket.send_json({
+                    "type": "bar", "date": bar.date.date().isoformat(),
+                    "close": bar.close, **state,
+                })
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
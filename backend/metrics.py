@@ -0,0 +1,194 @@
+"""Per-stage timing and Prometheus metrics.
+
+Code wraps its expensive steps in ``with stage("name"):``. Every stage is
+recorded in a latency histogram labelled by endpoint, strategy and stage.
+Stages that run while an HTTP request is being served are also summed
+per request and reported in its ``Server-Timing`` header. Stage totals
+are summed over tickers, so concurrent work can add up to more than the
+wall time. Setting ``METRICS_ENABLED=0`` turns ``stage`` into a shared
+no-op context manager and leaves the timing middleware uninstalled.
+"""
+import bisect
+import contextvars
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...],
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Per label set: bucket counts (non-cumulative), sum, count.
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    names, values = self.labelnames + ("le",), labels + (le,)
+                    lines.append(f"{self.name}_bucket{_labels(names, values)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total:.6f}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+REQUEST_SECONDS = Histogram(
+    "request_duration_seconds", "Time until the response starts, per endpoint.",
+    ("endpoint", "strategy"),
+)
+STAGE_SECONDS = Histogram(
+    "stage_duration_seconds", "Time spent per processing stage.",
+    ("endpoint", "strategy", "stage"),
+)
+TICKERS = Counter(
+    "tickers_processed_total", "Per-ticker results returned.",
+    ("endpoint", "outcome"),
+)
+FETCH_ERRORS = Counter("fetch_errors_total", "Price fetches that raised.", ())
+CACHE_LOOKUPS = Counter(
+    "result_cache_lookups_total", "Result cache lookups by outcome.", ("result",),
+)
+REGISTRY = [REQUEST_SECONDS, STAGE_SECONDS, TICKERS, FETCH_ERRORS, CACHE_LOOKUPS]
+
+
+class RequestTimer:
+    """Stage totals and labels collected while serving one request."""
+
+    def __init__(self, endpoint: str):
+        self.labels = {"endpoint": endpoint, "strategy": ""}
+        self.stages: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        parts = [f"{name};dur={seconds * 1e3:.2f}" for name, seconds in self.stages.items()]
+        parts.append(f"total;dur={total * 1e3:.2f}")
+        return ", ".join(parts)
+
+
+_current: contextvars.ContextVar[RequestTimer | None] = contextvars.ContextVar(
+    "request_timer", default=None
+)
+_NOOP = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("name", "began")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.began = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.began
+        timer = _current.get()
+        if timer is None:
+            STAGE_SECONDS.observe(("", "", self.name), elapsed)
+        else:
+            labels = timer.labels
+            STAGE_SECONDS.observe((labels["endpoint"], labels["strategy"], self.name), elapsed)
+            timer.add(self.name, elapsed)
+        return False
+
+
+def stage(name: str):
+    """Context manager timing one processing stage."""
+    return _Stage(name) if ENABLED else _NOOP
+
+
+def label(**labels: str) -> None:
+    """Attach labels such as ``strategy`` to the current request's metrics."""
+    timer = _current.get()
+    if timer is not None:
+        timer.labels.update(labels)
+
+
+def count_results(endpoint: str, results: list[dict]) -> None:
+    if not ENABLED:
+        return
+    failed = sum(1 for r in results if "error" in r)
+    if failed:
+        TICKERS.inc((endpoint, "error"), failed)
+    if len(results) > failed:
+        TICKERS.inc((endpoint, "ok"), len(results) - failed)
+
+
+def start_request(endpoint: str) -> tuple[RequestTimer, contextvars.Token]:
+    timer = RequestTimer(endpoint)
+    return timer, _current.set(timer)
+
+
+def finish_request(timer: RequestTimer, token: contextvars.Token, total: float) -> str:
+    """Record the request latency and return its ``Server-Timing`` value."""
+    _current.reset(token)
+    REQUEST_SECONDS.observe((timer.labels["endpoint"], timer.labels["strategy"]), total)
+    return timer.server_timing(total)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,92 @@
+"""Vectorized multi-asset portfolio backtests with rebalancing.
+
+Prices are a dates x assets matrix. Between two rebalances the share
+counts are fixed, so the value on every day of a segment is the segment's
+starting value times ``(prices / segment_start_prices) @ weights``. The
+segments' growth factors chain with a cumulative product, which gives the
+whole value path without stepping through the days one by one.
+"""
+import numpy as np
+import pandas as pd
+
+PERIODS = ("monthly", "quarterly", "yearly")
+REBALANCE = ("none", "threshold") + PERIODS
+TRADING_DAYS = 252
+
+
+def period_starts(dates: pd.DatetimeIndex, period: str) -> np.ndarray:
+    """Rows of the first trading day of each month, quarter or year after the first."""
+    if period == "monthly":
+        code = dates.year * 12 + dates.month
+    elif period == "quarterly":
+        code = dates.year * 4 + (dates.month - 1) // 3
+    elif period == "yearly":
+        code = dates.year
+    else:
+        raise ValueError("Invalid rebalance")
+    return np.flatnonzero(np.diff(np.asarray(code)) != 0) + 1
+
+
+def threshold_starts(prices: np.ndarray, weights: np.ndarray, threshold: float,
+                     block: int = 256) -> np.ndarray:
+    """Rows where some asset's weight has drifted more than ``threshold``.
+
+    Each rebalance resets the drift, so the search is sequential in the
+    number of rebalances but vectorized over the days between them. Days
+    are scanned in blocks that double until a breach is found.
+    """
+    starts = []
+    start, n = 0, len(prices)
+    while start < n - 1:
+        size, breach = block, None
+        lo = start + 1
+        while lo < n:
+            hi = min(n, lo + size)
+            held = prices[lo:hi] / prices[start] * weights
+            drift = np.abs(held / held.sum(axis=1, keepdims=True) - weights)
+            hits = np.flatnonzero((drift > threshold).any(axis=1))
+            if len(hits):
+                breach = lo + hits[0]
+                break
+            lo, size = hi, size * 2
+        if breach is None:
+            break
+        starts.append(breach)
+        start = breach
+    return np.array(starts, dtype=int)
+
+
+def backtest(prices: np.ndarray, weights: np.ndarray, amount: float,
+             starts: np.ndarray) -> dict[str, np.ndarray]:
+    """Value path, holdings and trades when rebalancing to ``weights`` at ``starts``.
+
+    ``starts`` are the rows (after the first) where holdings are reset to
+    the target weights. Returns the daily ``value``, the ``shares`` held
+    from each segment start and the ``turnover`` traded at each rebalance.
+    """
+    seg_starts = np.concatenate(([0], starts)).astype(int)
+    seg_id = np.searchsorted(seg_starts, np.arange(len(prices)), side="right") - 1
+    growth = (prices / prices[seg_starts[seg_id]]) @ weights
+    seg_growth = (prices[seg_starts[1:]] / prices[seg_starts[:-1]]) @ weights
+    seg_value = amount * np.concatenate(([1.0], np.cumprod(seg_growth)))
+    shares = weights * seg_value[:, None] / prices[seg_starts]
+    turnover = (np.abs(np.diff(shares, axis=0)) * prices[seg_starts[1:]]).sum(axis=1)
+    return {
+        "value": seg_value[seg_id] * growth,
+        "rebalances": seg_starts[1:],
+        "shares": shares,
+        "turnover": turnover,
+    }
+
+
+def summary(value: np.ndarray, dates: pd.DatetimeIndex) -> dict[str, float]:
+    """Total and annualized return, annualized volatility and max drawdown."""
+    years = max((dates[-1] - dates[0]).days / 365.25, 1 / 365.25)
+    log_returns = np.diff(np.log(value))
+    return {
+        "total_return": float(value[-1] / value[0] - 1),
+        "annual_return": float((value[-1] / value[0]) ** (1 / years) - 1),
+        "volatility": float(log_returns.std(ddof=1) * np.sqrt(TRADING_DAYS))
+        if len(log_returns) > 1 else 0.0,
+        "max_drawdown": float((value / np.maximum.accumulate(value) - 1).min()),
+    }
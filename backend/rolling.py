@@ -0,0 +1,24 @@
+"""Monthly and lump-sum outcomes for every possible start month.
+
+Investing ``amount`` over ``horizon`` monthly prices starting at month
+``s`` ends with ``amount / horizon * p[s + horizon - 1] * sum(1 / p[s:s + horizon])``
+under monthly investing and ``amount * p[s + horizon - 1] / p[s]`` as a
+lump sum. With a prefix sum of ``1 / p`` each window's sum is one
+subtraction, so all start months together cost O(n) instead of O(n * horizon).
+"""
+import numpy as np
+
+
+def start_dates(prices: np.ndarray, horizon: int,
+                amount: float) -> tuple[np.ndarray, np.ndarray]:
+    """Final monthly and lump-sum values for each start ``0 .. n - horizon``."""
+    if horizon < 1:
+        raise ValueError("Invalid horizon")
+    if horizon > len(prices):
+        raise ValueError("Horizon is longer than the price history")
+    inverse = np.zeros(len(prices) + 1)
+    np.cumsum(1.0 / prices, out=inverse[1:])
+    end = prices[horizon - 1:]
+    monthly = amount / horizon * (inverse[horizon:] - inverse[:-horizon]) * end
+    lump_sum = amount * end / prices[:len(end)]
+    return monthly, lump_sum
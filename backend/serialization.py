@@ -0,0 +1,140 @@
+"""Response encoding for simulation results.
+
+Series can be emitted either as the original list of per-point dicts
+(``records``) or as parallel arrays of epoch-second dates and values
+(``columnar``). Columnar payloads keep NumPy arrays until encoding, so a
+fast encoder can write them without boxing every point. ``orjson``,
+``pyarrow`` and ``brotli`` are optional; without them the standard
+``json`` module and gzip are used and Arrow IPC is unavailable.
+"""
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+FORMATS = ("records", "columnar")
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+# Bodies smaller than this are not worth compressing.
+MIN_COMPRESS_SIZE = 1024
+
+
+def epoch_seconds(index: pd.DatetimeIndex) -> np.ndarray:
+    return pd.DatetimeIndex(index).values.astype("datetime64[s]").astype(np.int64)
+
+
+def price_series(prices: pd.Series, fmt: str) -> list[dict] | dict:
+    """Encode a price series in the requested response format."""
+    if fmt == "columnar":
+        return {"dates": epoch_seconds(prices.index), "price": prices.to_numpy(dtype=float)}
+    return [
+        {"date": d.strftime("%Y-%m") if hasattr(d, "strftime") else str(d),
+         "price": float(p)}
+        for d, p in prices.items()
+    ]
+
+
+def ma_series(short_ma: pd.Series, long_ma: pd.Series, fmt: str) -> list[dict] | dict:
+    """Encode moving averages; columnar output shares the price dates."""
+    if fmt == "columnar":
+        return {"short": short_ma.to_numpy(dtype=float), "long": long_ma.to_numpy(dtype=float)}
+    return [
+        {
+            "date": d.strftime("%Y-%m") if hasattr(d, "strftime") else str(d),
+            "short": None if pd.isna(s) else float(s),
+            "long": None if pd.isna(l) else float(l),
+        }
+        for d, s, l in zip(short_ma.index, short_ma, long_ma)
+    ]
+
+
+def _plain(obj):
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind == "f":
+            return [None if np.isnan(v) else v for v in obj.tolist()]
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def dumps(payload) -> bytes:
+    """Encode ``payload`` as JSON, writing NumPy arrays directly; NaN becomes null."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, default=_plain, separators=(",", ":")).encode()
+
+
+def to_arrow(results: list[dict]) -> bytes:
+    """Encode columnar results as one Arrow IPC stream.
+
+    Rows are ``(ticker, date, price, short, long)``; per-ticker values and
+    errors are stored as JSON in the schema metadata under ``results``.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is not installed")
+    columns = {"ticker": [], "date": [], "price": [], "short": [], "long": []}
+    summary = []
+    for r in results:
+        prices = r.get("prices") or {"dates": np.empty(0, np.int64), "price": np.empty(0)}
+        n = len(prices["dates"])
+        ma = r.get("ma_data") or {"short": np.full(n, np.nan), "long": np.full(n, np.nan)}
+        columns["ticker"].append(np.full(n, r["ticker"], dtype=object))
+        columns["date"].append(prices["dates"])
+        columns["price"].append(prices["price"])
+        columns["short"].append(ma["short"])
+        columns["long"].append(ma["long"])
+        summary.append({k: v for k, v in r.items() if k not in ("prices", "ma_data")})
+    arrays = {k: np.concatenate(v) if v else np.empty(0) for k, v in columns.items()}
+    table = pa.table({
+        "ticker": pa.array(arrays["ticker"], pa.string()).dictionary_encode(),
+        "date": pa.array(arrays["date"].astype("datetime64[s]")),
+        "price": pa.array(arrays["price"], pa.float64(), from_pandas=True),
+        "short": pa.array(arrays["short"], pa.float64(), from_pandas=True),
+        "long": pa.array(arrays["long"], pa.float64(), from_pandas=True),
+    }).replace_schema_metadata({"results": json.dumps(summary)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def wants_arrow(request: Request) -> bool:
+    return ARROW_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def respond(payload: dict, request: Request) -> Response:
+    """Encode ``payload`` as JSON or Arrow and compress it if the client allows.
+
+    Only per-ticker ``results`` have an Arrow encoding; other payloads are
+    always JSON.
+    """
+    if wants_arrow(request) and "results" in payload:
+        body, media_type = to_arrow(payload["results"]), ARROW_MEDIA_TYPE
+    else:
+        body, media_type = dumps(payload), "application/json"
+
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    accepted = request.headers.get("accept-encoding", "")
+    if len(body) >= MIN_COMPRESS_SIZE:
+        if brotli is not None and "br" in accepted:
+            body, headers["Content-Encoding"] = brotli.compress(body, quality=5), "br"
+        elif "gzip" in accepted:
+            body, headers["Content-Encoding"] = gzip.compress(body, compresslevel=6), "gzip"
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -0,0 +1,147 @@
+"""On-disk price store with incremental refresh.
+
+Each ticker is kept as one ``.npy`` file holding a structured array of
+``(date, close)`` rows sorted by date, next to a small JSON sidecar that
+records the ``[start, end)`` range already fetched from upstream. Reads
+only touch local files; refreshes fetch just the part of the requested
+range that is not covered yet.
+
+Upstream closes are split- and dividend-adjusted, and every new corporate
+action rewrites all earlier adjusted closes. Each partial fetch therefore
+also re-downloads the stored bar next to it; if that bar changed, the
+whole covered range is fetched again so stored rows never mix bases.
+"""
+import json
+import os
+import threading
+from datetime import date, timedelta
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+PRICE_DTYPE = np.dtype([("date", "datetime64[D]"), ("close", "f8")])
+
+# Callable returning daily closes for ``ticker`` in ``[start, end)``.
+Fetcher = Callable[[str, date, date], pd.Series]
+
+
+class PriceStore:
+    """Columnar per-ticker store of daily closing prices."""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, ticker: str, ext: str) -> str:
+        name = ticker.upper().replace("/", "_").replace("\\", "_")
+        return os.path.join(self.root, f"{name}.{ext}")
+
+    def _read(self, ticker: str) -> np.ndarray:
+        path = self._path(ticker, "npy")
+        if not os.path.exists(path):
+            return np.empty(0, dtype=PRICE_DTYPE)
+        return np.load(path)
+
+    def coverage(self, ticker: str) -> tuple[date, date] | None:
+        """Return the ``[start, end)`` range already fetched for ``ticker``."""
+        path = self._path(ticker, "json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            meta = json.load(f)
+        return date.fromisoformat(meta["start"]), date.fromisoformat(meta["end"])
+
+    def load(self, ticker: str, start: date | None = None,
+             end: date | None = None) -> pd.Series:
+        """Return stored closes for ``ticker`` in ``[start, end)``."""
+        rows = self._read(ticker)
+        dates = rows["date"]
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(start, "D"))
+        hi = len(rows) if end is None else np.searchsorted(dates, np.datetime64(end, "D"))
+        return pd.Series(
+            rows["close"][lo:hi],
+            index=pd.DatetimeIndex(dates[lo:hi].astype("datetime64[ns]")),
+            name=ticker,
+        )
+
+    def write(self, ticker: str, closes: pd.Series, start: date, end: date,
+              replace: bool = False) -> None:
+        """Merge ``closes`` into the store and extend coverage to ``[start, end)``.
+
+        With ``replace`` the stored rows and coverage are discarded first.
+        """
+        with self._lock:
+            existing = np.empty(0, dtype=PRICE_DTYPE) if replace else self._read(ticker)
+            new = np.empty(len(closes), dtype=PRICE_DTYPE)
+            new["date"] = pd.DatetimeIndex(closes.index).values.astype("datetime64[D]")
+            new["close"] = np.asarray(closes, dtype="f8")
+            new = new[~np.isnan(new["close"])]
+            # Fresh rows win over stored ones for the same date.
+            merged = np.concatenate([new, existing])
+            _, first = np.unique(merged["date"], return_index=True)
+            merged = merged[first]
+
+            cov = None if replace else self.coverage(ticker)
+            if cov is not None:
+                start, end = min(start, cov[0]), max(end, cov[1])
+            self._replace(self._path(ticker, "npy"), lambda f: np.save(f, merged))
+            meta = {"start": start.isoformat(), "end": end.isoformat()}
+            self._replace(self._path(ticker, "json"), lambda f: f.write(json.dumps(meta).encode()))
+
+    @staticmethod
+    def _replace(path: str, dump: Callable) -> None:
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            dump(f)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _same_close(stored: pd.Series, fetched: pd.Series, day: pd.Timestamp) -> bool:
+        """Whether ``fetched`` agrees with ``stored`` on ``day`` (or lacks it)."""
+        if day not in fetched.index:
+            return True
+        return bool(np.isclose(fetched[day], stored[day], rtol=1e-6, atol=0))
+
+    def refresh(self, ticker: str, start: date, end: date, fetch: Fetcher) -> pd.Series:
+        """Fetch whatever part of ``[start, end)`` is missing, then load it.
+
+        Only the head before the first covered day and the tail after the
+        last covered day are requested from ``fetch``, each extended to
+        include the neighbouring stored bar. If that bar's close changed,
+        the adjustment basis moved and the whole range is refetched. An
+        empty first fetch is not recorded so that a failed lookup is
+        retried next time.
+        """
+        cov = self.coverage(ticker)
+        if cov is None:
+            closes = fetch(ticker, start, end)
+            if not closes.empty:
+                self.write(ticker, closes, start, end)
+            return self.load(ticker, start, end)
+
+        stored = self.load(ticker)
+        parts, consistent = [], True
+        if start < cov[0]:
+            head_end = cov[0]
+            if not stored.empty:
+                head_end = max(cov[0], stored.index[0].date() + timedelta(days=1))
+            head = fetch(ticker, start, head_end)
+            consistent &= stored.empty or self._same_close(stored, head, stored.index[0])
+            parts.append((head, start, cov[0]))
+        if end > cov[1]:
+            tail_start = cov[1] if stored.empty else min(cov[1], stored.index[-1].date())
+            tail = fetch(ticker, tail_start, end)
+            consistent &= stored.empty or self._same_close(stored, tail, stored.index[-1])
+            parts.append((tail, cov[1], end))
+
+        if not consistent:
+            full_start, full_end = min(start, cov[0]), max(end, cov[1])
+            closes = fetch(ticker, full_start, full_end)
+            if not closes.empty:
+                self.write(ticker, closes, full_start, full_end, replace=True)
+        else:
+            for closes, part_start, part_end in parts:
+                self.write(ticker, closes, part_start, part_end)
+        return self.load(ticker, start, end)
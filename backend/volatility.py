@@ -0,0 +1,99 @@
+"""Cross-sectional return statistics on an aligned price matrix.
+
+Closes for every ticker are aligned into one dates x tickers matrix, so
+the box-plot quantiles, rolling volatility and correlation of any number
+of tickers come out of a few NumPy calls instead of a loop of pandas
+operations. Missing prices are NaN; each ticker's returns are taken
+between its own consecutive prices, so results for one ticker do not
+depend on which other tickers share the matrix.
+"""
+import numpy as np
+import pandas as pd
+
+QUANTILES = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+
+def align(closes: dict[str, pd.Series]) -> tuple[pd.DatetimeIndex, np.ndarray]:
+    """Union of all dates and the matching dates x tickers close matrix."""
+    dates = pd.DatetimeIndex([])
+    for series in closes.values():
+        dates = dates.union(series.index)
+    matrix = np.full((len(dates), len(closes)), np.nan)
+    for j, series in enumerate(closes.values()):
+        matrix[dates.get_indexer(series.index), j] = series.to_numpy(dtype=float)
+    return dates, matrix
+
+
+def daily_returns(matrix: np.ndarray) -> np.ndarray:
+    """Simple returns per column; NaN where the column has no price.
+
+    A return spans from the column's previous price, however many rows
+    back it is, as ``pct_change`` on the ticker's own series would.
+    """
+    valid = ~np.isnan(matrix)
+    rows = np.arange(len(matrix))[:, None]
+    last = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+    previous = np.full_like(matrix, np.nan)
+    has_previous = last[:-1] >= 0
+    cols = np.broadcast_to(np.arange(matrix.shape[1]), last[:-1].shape)
+    previous[1:][has_previous] = matrix[last[:-1][has_previous], cols[has_previous]]
+    returns = matrix / previous - 1
+    returns[~valid] = np.nan
+    return returns
+
+
+def box_stats(returns: np.ndarray) -> dict[str, np.ndarray]:
+    """Min, quartiles, max and sample std of every column, ignoring NaN."""
+    q = np.nanquantile(returns, QUANTILES, axis=0)
+    return {
+        "min": q[0], "q1": q[1], "median": q[2], "q3": q[3], "max": q[4],
+        "std": np.nanstd(returns, axis=0, ddof=1),
+    }
+
+
+def rolling_std(returns: np.ndarray, window: int) -> np.ndarray:
+    """Sample std over each column's last ``window`` returns.
+
+    Windows count a column's own returns, skipping rows where it has
+    none; rows without a return, or with fewer than ``window`` before
+    them, are NaN.
+    """
+    if window < 2:
+        raise ValueError("window must be at least 2")
+    out = np.full_like(returns, np.nan)
+    for j in range(returns.shape[1]):
+        rows = np.flatnonzero(~np.isnan(returns[:, j]))
+        x = returns[rows, j]
+        if len(x) < window:
+            continue
+        # Centre first so the running sums lose little precision.
+        x = x - x.mean()
+        s = np.cumsum(np.concatenate(([0.0], x)))
+        s2 = np.cumsum(np.concatenate(([0.0], x * x)))
+        total = s[window:] - s[:-window]
+        total_sq = s2[window:] - s2[:-window]
+        var = (total_sq - total * total / window) / (window - 1)
+        out[rows[window - 1:], j] = np.sqrt(np.maximum(var, 0.0))
+    return out
+
+
+def covariance(returns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Pairwise covariance and correlation matrices of the columns.
+
+    Each pair uses the rows where both columns have a return, matching
+    ``DataFrame.cov``/``DataFrame.corr``; pairs with fewer than two
+    common rows are NaN.
+    """
+    mask = ~np.isnan(returns)
+    m = mask.astype(float)
+    x = np.where(mask, returns - np.nanmean(returns, axis=0), 0.0)
+    n = m.T @ m
+    sum_x = x.T @ m  # [i, j]: sum of column i over rows where j is present
+    sum_xx = (x * x).T @ m
+    sum_xy = x.T @ x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ddof_n = np.where(n > 1, n - 1, np.nan)
+        cov = (sum_xy - sum_x * sum_x.T / n) / ddof_n
+        var_i = (sum_xx - sum_x * sum_x / n) / ddof_n
+        corr = cov / np.sqrt(var_i * var_i.T)
+    return cov, np.clip(corr, -1.0, 1.0)
@@ -0,0 +1,153 @@
+"""Offline performance benchmarks for the backend and golden_cross_roi.py.
+
+Every case runs against :class:`SyntheticBackend`, so timings do not
+depend on the network. Results are written as JSON; passing an earlier
+result file with ``--baseline`` reports every case that got slower than
+``--threshold`` and exits with status 1 if any did.
+
+    python benchmarks/bench.py --tickers 1 10 --years 5 20 --output bench.json
+    python benchmarks/bench.py --baseline bench.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+import pandas as pd
+
+from main import (
+    CorrelationRequest, MonteCarloRequest, PortfolioRequest, RollingRequest,
+    SimulateRequest, SyntheticBackend, VolatilityRequest, history_window,
+)
+
+STRATEGIES = ["monthly", "lump_sum", "both", "ma_crossover"]
+
+
+def measure(fn: Callable[[], object], repeat: int) -> float:
+    """Median wall time of ``repeat`` calls after one warm-up call."""
+    fn()
+    times = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - began)
+    return statistics.median(times)
+
+
+def golden_cross_pipeline(df: pd.DataFrame) -> Callable[[], object]:
+    import golden_cross_roi as gc
+
+    def run():
+        frame = df.copy()
+        gc.compute_ma(frame, 50, 200)
+        golden, dead = gc.compute_signals(frame)
+        return gc.compute_rois(frame, gc.pair_trades(golden, dead))
+    return run
+
+
+def build_cases(ticker_counts: list[int], years: list[int]) -> dict[str, Callable[[], object]]:
+    cases = {}
+    for y in years:
+        backend = SyntheticBackend(seed=42, history_years=y)
+        for n in ticker_counts:
+            tickers = [f"SYN{i}" for i in range(n)]
+            for strategy in STRATEGIES:
+                request = SimulateRequest(
+                    tickers=tickers, amounts=[10000] * n, strategy=strategy,
+                    short_window=6, long_window=24,
+                )
+                cases[f"simulate/{strategy}/t{n}/y{y}"] = (
+                    lambda b=backend, r=request: b.simulate(r)
+                )
+            request = VolatilityRequest(tickers=tickers)
+            cases[f"volatility/t{n}/y{y}"] = lambda b=backend, r=request: b.volatility(r)
+            for rebalance in ("monthly", "threshold"):
+                request = PortfolioRequest(tickers=tickers, rebalance=rebalance, years=y)
+                cases[f"portfolio/{rebalance}/t{n}/y{y}"] = (
+                    lambda b=backend, r=request: b.portfolio(r)
+                )
+            request = CorrelationRequest(tickers=tickers)
+            cases[f"correlation/t{n}/y{y}"] = lambda b=backend, r=request: b.correlation(r)
+
+        request = MonteCarloRequest(tickers=["SYN0"], amounts=[10000], paths=100000)
+        cases[f"montecarlo/p100000/y{y}"] = lambda b=backend, r=request: b.montecarlo(r)
+
+        request = RollingRequest(tickers=["SYN0"], amounts=[10000], horizon_months=12, years=y)
+        cases[f"rolling/h12/y{y}"] = lambda b=backend, r=request: b.rolling(r)
+
+        closes = backend.close_prices("SYN0", *history_window(y))
+        cases[f"moving_average_crossover/y{y}"] = (
+            lambda c=closes: SyntheticBackend.moving_average_crossover(c, 10000, 50, 200)
+        )
+        try:
+            cases[f"golden_cross_roi/y{y}"] = golden_cross_pipeline(closes.to_frame("Close"))
+        except ImportError as e:
+            print(f"skipping golden_cross_roi/y{y}: {e}", file=sys.stderr)
+    return cases
+
+
+def compare(results: dict[str, float], baseline: dict[str, float],
+            threshold: float) -> list[str]:
+    """Describe every case that is more than ``threshold`` slower than baseline."""
+    regressions = []
+    for name, seconds in sorted(results.items()):
+        before = baseline.get(name)
+        if before and seconds > before * (1 + threshold):
+            regressions.append(f"{name}: {before * 1e3:.3f} ms -> {seconds * 1e3:.3f} ms "
+                               f"(+{(seconds / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run offline performance benchmarks")
+    parser.add_argument("--tickers", type=int, nargs="+", default=[1, 10, 50],
+                        help="Ticker counts per request")
+    parser.add_argument("--years", type=int, nargs="+", default=[5, 20],
+                        help="History lengths in years")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    parser.add_argument("--filter", default="", help="Only run cases containing this text")
+    parser.add_argument("--output", default="bench_results.json", help="Result file to write")
+    parser.add_argument("--baseline", help="Earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown relative to the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        # Read first, as the baseline may be the file about to be overwritten.
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    results = {}
+    for name, fn in build_cases(args.tickers, args.years).items():
+        if args.filter in name:
+            results[name] = measure(fn, args.repeat)
+            print(f"{name:45s} {results[name] * 1e3:10.3f} ms")
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import StrategySimulator from './StrategySimulator.jsx';
 import VolatilityComparison from './VolatilityComparison.jsx';
+import LiveSignals from './LiveSignals.jsx';
 
 export default function App() {
   const [page, setPage] = useState('home');
@@ -23,12 +24,16 @@ export default function App() {
   if (page === 'volatility') {
     return <VolatilityComparison onBack={() => setPage('home')} />;
   }
+  if (page === 'signals') {
+    return <LiveSignals onBack={() => setPage('home')} />;
+  }
 
   return (
     <div style={containerStyle}>
       <h1>Quant Finance Projects</h1>
       <button onClick={() => setPage('simulator')} style={{padding:'12px', width:'260px'}}>Investment Strategy Simulator</button>
       <button onClick={() => setPage('volatility')} style={{padding:'12px', width:'260px'}}>Stock Volatility Comparison</button>
+      <button onClick={() => setPage('signals')} style={{padding:'12px', width:'260px'}}>Live Crossover Signals</button>
     </div>
   );
 }
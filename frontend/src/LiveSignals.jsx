@@ -0,0 +1,79 @@
+import React, { useEffect, useRef, useState } from 'react';
+
+const fmt = v => (v == null ? '-' : v.toFixed(2));
+
+export default function LiveSignals({ onBack }) {
+  const [tickers, setTickers] = useState(['AAPL', 'TSLA']);
+  const [shortWindow, setShortWindow] = useState(20);
+  const [longWindow, setLongWindow] = useState(60);
+  const [latest, setLatest] = useState({});
+  const [events, setEvents] = useState([]);
+  const socket = useRef(null);
+
+  const disconnect = () => {
+    if (socket.current) socket.current.close();
+    socket.current = null;
+  };
+
+  useEffect(() => disconnect, []);
+
+  const connect = () => {
+    disconnect();
+    setLatest({});
+    setEvents([]);
+    const query = `tickers=${tickers.join(',')}&short=${shortWindow}&long=${longWindow}`;
+    const ws = new WebSocket(`ws://localhost:8000/ws/signals?${query}`);
+    ws.onmessage = e => {
+      const msg = JSON.parse(e.data);
+      const states = msg.type === 'snapshot' ? msg.results : [msg];
+      setLatest(prev => {
+        const next = { ...prev };
+        for (const s of states) next[s.ticker] = s;
+        return next;
+      });
+      if (msg.type === 'bar' && msg.event) {
+        setEvents(prev => [msg, ...prev].slice(0, 50));
+      }
+    };
+    socket.current = ws;
+  };
+
+  return (
+    <div style={{ padding: '20px', color: 'white' }}>
+      <button onClick={onBack} style={{ marginBottom: '20px' }}>Back</button>
+      <h1>Live Crossover Signals</h1>
+      <textarea rows={2} style={{ width: '100%' }} value={tickers.join(',')}
+        onChange={e => setTickers(e.target.value.split(',').map(t => t.trim().toUpperCase()).filter(Boolean))}/>
+      <div style={{ marginTop: '10px' }}>
+        Short <input type="number" value={shortWindow} onChange={e => setShortWindow(Number(e.target.value))} style={{ width: '60px' }}/>
+        {' '}Long <input type="number" value={longWindow} onChange={e => setLongWindow(Number(e.target.value))} style={{ width: '60px' }}/>
+        {' '}<button onClick={connect}>Connect</button>
+      </div>
+      <table style={{ marginTop: '20px', width: '100%' }}>
+        <thead>
+          <tr><th>Ticker</th><th>Date</th><th>Close</th><th>Short MA</th><th>Long MA</th><th>Position</th></tr>
+        </thead>
+        <tbody>
+          {Object.values(latest).map(s => (
+            <tr key={s.ticker}>
+              <td>{s.ticker}</td>
+              {s.error ? <td colSpan={5}>{s.error}</td> : (
+                <>
+                  <td>{s.date}</td><td>{fmt(s.close)}</td><td>{fmt(s.short)}</td>
+                  <td>{fmt(s.long)}</td><td>{s.position ? 'Invested' : 'Cash'}</td>
+                </>
+              )}
+            </tr>
+          ))}
+        </tbody>
+      </table>
+      {events.length > 0 && (
+        <ul style={{ marginTop: '20px' }}>
+          {events.map((e, i) => (
+            <li key={i}>{e.date} {e.ticker}: {e.event === 'golden_cross' ? 'Golden cross (buy)' : 'Dead cross (sell)'}</li>
+          ))}
+        </ul>
+      )}
+    </div>
+  );
+}
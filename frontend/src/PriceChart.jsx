@@ -15,26 +15,29 @@ export default function PriceChart({ data, tickers }) {
           type="monotone"
           dataKey={t}
           stroke={colors[idx % colors.length]}
+          connectNulls
         />
       ))}
       {tickers.map((t) => (
         <>
-          {data.length > 0 && data[0][`${t}_short`] !== undefined && (
+          {data.some((d) => d[`${t}_short`] !== undefined) && (
             <Line
               key={`${t}_short`}
               type="monotone"
               dataKey={`${t}_short`}
               stroke="#cccccc"
               strokeDasharray="5 5"
+              connectNulls
             />
           )}
-          {data.length > 0 && data[0][`${t}_long`] !== undefined && (
+          {data.some((d) => d[`${t}_long`] !== undefined) && (
             <Line
               key={`${t}_long`}
               type="monotone"
               dataKey={`${t}_long`}
               stroke="#ff0000"
               strokeDasharray="3 3"
+              connectNulls
             />
           )}
         </>
@@ -1,8 +1,10 @@
 import React, { useState } from "react";
-import axios from "axios";
 import ResultChart from "./Chart.jsx";
 import PriceChart from "./PriceChart.jsx";
 
+// Series longer than this are downsampled by the server for the chart.
+const MAX_CHART_POINTS = 1000;
+
 function StrategySimulator({ onBack }) {
   const [numTickers, setNumTickers] = useState(1);
   const [tickers, setTickers] = useState(["AAPL"]);
@@ -13,21 +15,21 @@ function StrategySimulator({ onBack }) {
   const [results, setResults] = useState([]);
 
   const priceData = React.useMemo(() => {
-    if (results.length === 0) return [];
-    const length = results[0].prices.length;
-    const arr = [];
-    for (let i = 0; i < length; i++) {
-      const entry = { date: results[0].prices[i].date };
-      results.forEach((r) => {
-        entry[r.ticker] = r.prices[i]?.price;
+    // Merge by date: downsampled tickers keep different points, and
+    // tickers can cover different periods.
+    const byDate = new Map();
+    results.forEach((r) => {
+      r.prices.forEach((p, i) => {
+        const entry = byDate.get(p.date) || { date: p.date };
+        entry[r.ticker] = p.price;
         if (r.ma_data) {
           entry[`${r.ticker}_short`] = r.ma_data[i]?.short;
           entry[`${r.ticker}_long`] = r.ma_data[i]?.long;
         }
+        byDate.set(p.date, entry);
       });
-      arr.push(entry);
-    }
-    return arr;
+    });
+    return [...byDate.values()].sort((a, b) => a.date.localeCompare(b.date));
   }, [results]);
 
   const handleTickerChange = (index, value) => {
@@ -45,14 +47,31 @@ function StrategySimulator({ onBack }) {
   const simulate = async () => {
     const validTickers = tickers.filter((t) => t);
     const usedAmounts = amounts.slice(0, validTickers.length);
-    const response = await axios.post("http://localhost:8000/simulate", {
-      tickers: validTickers,
-      amounts: usedAmounts,
-      strategy,
-      short_window: shortWindow,
-      long_window: longWindow,
+    setResults([]);
+    // Results arrive one NDJSON line per ticker as soon as each is computed.
+    const response = await fetch("http://localhost:8000/simulate/stream", {
+      method: "POST",
+      headers: { "Content-Type": "application/json", Accept: "application/x-ndjson" },
+      body: JSON.stringify({
+        tickers: validTickers,
+        amounts: usedAmounts,
+        strategy,
+        short_window: shortWindow,
+        long_window: longWindow,
+        max_points: MAX_CHART_POINTS,
+      }),
     });
-    setResults(response.data.results);
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = "";
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value;
+      const lines = buffer.split("\n");
+      buffer = lines.pop();
+      const received = lines.filter((line) => line.trim()).map((line) => JSON.parse(line));
+      if (received.length > 0) setResults((prev) => [...prev, ...received]);
+    }
   };
 
   return (
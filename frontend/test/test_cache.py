@@ -0,0 +1,32 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from datetime import date, datetime, timezone
+
+from cache import ResultCache, as_of_date, next_market_close
+
+
+def test_as_of_date_uses_last_close():
+    # Friday 2024-03-08 18:00 UTC is 13:00 in New York, before the close.
+    assert as_of_date(datetime(2024, 3, 8, 18, tzinfo=timezone.utc)) == date(2024, 3, 7)
+    # Saturday and Sunday still report Friday's close.
+    assert as_of_date(datetime(2024, 3, 9, 22, tzinfo=timezone.utc)) == date(2024, 3, 8)
+    assert as_of_date(datetime(2024, 3, 10, 22, tzinfo=timezone.utc)) == date(2024, 3, 8)
+
+
+def test_next_market_close_skips_weekend():
+    close = next_market_close(datetime(2024, 3, 8, 22, tzinfo=timezone.utc))
+    assert (close.date(), close.hour) == (date(2024, 3, 11), 16)
+
+
+def test_lru_eviction_and_hit_counts():
+    cache = ResultCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert len(cache) == 2
@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+import numpy as np
+import pandas as pd
+import crossover
+
+
+def loop_crossover(prices, cash, short, long):
+    """Bar-by-bar reference implementation of the crossover strategy."""
+    series = pd.Series(prices)
+    short_ma = series.rolling(window=short).mean()
+    long_ma = series.rolling(window=long).mean()
+    shares = 0.0
+    for s, l, price in zip(short_ma, long_ma, series):
+        if pd.isna(s) or pd.isna(l):
+            continue
+        if s > l and shares == 0.0:
+            shares, cash = cash / price, 0.0
+        elif s < l and shares > 0.0:
+            cash, shares = shares * price, 0.0
+    return cash + shares * series.iloc[-1]
+
+
+def test_rolling_mean_matches_pandas():
+    values = np.random.default_rng(0).normal(size=50).cumsum()
+    expected = pd.Series(values).rolling(window=7).mean().to_numpy()
+    np.testing.assert_allclose(crossover.rolling_mean(values, 7), expected)
+    assert np.isnan(crossover.rolling_mean(values, 51)).all()
+
+
+def test_crossover_matches_loop():
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.05, 120)))
+        short, long = sorted(rng.choice(np.arange(2, 40), 2, replace=False))
+        result = crossover.moving_average_crossover(prices, 1000.0, short, long)
+        assert np.isclose(result["final_value"], loop_crossover(prices, 1000.0, short, long))
+        np.testing.assert_allclose(
+            result["returns"], prices[result["sells"]] / prices[result["buys"]] - 1
+        )
+
+
+def test_pair_trades_uses_each_sell_once():
+    buys, sells = crossover.pair_trades(np.array([1, 3, 10]), np.array([2, 5, 6]))
+    assert buys.tolist() == [0, 1]
+    assert sells.tolist() == [0, 1]
+    buys, sells = crossover.pair_trades(np.array([1, 2]), np.array([4, 8]))
+    assert sells.tolist() == [0, 1]
+    assert crossover.pair_trades(np.array([5]), np.array([1]))[0].size == 0
+
+
+def test_sweep_matches_single_runs():
+    prices = 100 * np.exp(np.cumsum(np.random.default_rng(2).normal(0, 0.03, 300)))
+    shorts, longs = np.array([3, 5, 10]), np.array([5, 20, 40])
+    roi = crossover.sweep(prices, shorts, longs, max_cells=500)
+    for i, short in enumerate(shorts):
+        for j, long in enumerate(longs):
+            if short >= long:
+                assert np.isnan(roi[i, j])
+                continue
+            single = crossover.moving_average_crossover(prices, 1.0, short, long)
+            assert np.isclose(roi[i, j], single["final_value"] - 1)
+
+
+def test_missing_bar_only_affects_windows_containing_it():
+    prices = 100 * np.exp(np.random.default_rng(3).normal(0.005, 0.05, 60).cumsum())
+    prices[30] = np.nan  # e.g. a month with no bars after resampling
+    expected = pd.Series(prices).rolling(window=6).mean().to_numpy()
+    np.testing.assert_allclose(crossover.rolling_mean(prices, 6), expected)
+    np.testing.assert_allclose(crossover.rolling_means(prices, np.array([6]))[0], expected)
+
+    for short, long in [(3, 12), (2, 6), (5, 20)]:
+        result = crossover.moving_average_crossover(prices, 1000.0, short, long)
+        assert np.isfinite(result["final_value"])
+        assert np.isclose(result["final_value"], loop_crossover(prices, 1000.0, short, long))
@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+import math
+
+import numpy as np
+import downsample
+
+
+def reference_lttb(y, n_out):
+    """Straightforward LTTB as usually written, for comparison."""
+    n = len(y)
+    every = (n - 2) / (n_out - 2)
+    chosen, a = [0], 0
+    for i in range(n_out - 2):
+        lo, hi = math.floor(i * every) + 1, math.floor((i + 1) * every) + 1
+        next_lo, next_hi = hi, min(math.floor((i + 2) * every) + 1, n)
+        if i == n_out - 3:
+            cx, cy = n - 1, y[-1]
+        else:
+            cx = sum(range(next_lo, next_hi)) / (next_hi - next_lo)
+            cy = sum(y[next_lo:next_hi]) / (next_hi - next_lo)
+        best, best_area = lo, -1.0
+        for b in range(lo, hi):
+            area = abs((a - cx) * (y[b] - y[a]) - (a - b) * (cy - y[a]))
+            if area > best_area:
+                best, best_area = b, area
+        chosen.append(best)
+        a = best
+    return chosen + [n - 1]
+
+
+def test_lttb_matches_reference():
+    y = np.random.default_rng(0).normal(size=1000).cumsum()
+    for n_out in (3, 10, 97, 500, 999):
+        assert downsample.lttb(y, n_out).tolist() == reference_lttb(y.tolist(), n_out)
+    assert downsample.lttb(y, 2000).tolist() == list(range(1000))
+
+
+def test_select_keeps_extremes_and_required_points():
+    y = np.random.default_rng(1).normal(size=5000).cumsum()
+    keep = np.array([17, 1234, 4321])
+    shown = downsample.select(y, 200, keep)
+    assert len(shown) <= 200
+    assert (np.diff(shown) > 0).all()
+    assert {0, 4999, int(np.argmin(y)), int(np.argmax(y)), 17, 1234, 4321} <= set(shown.tolist())
+    assert downsample.select(y[:50], 200).tolist() == list(range(50))
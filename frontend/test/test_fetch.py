@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+from fetch import TickerFetcher
+
+START, END = date(2024, 1, 1), date(2024, 2, 1)
+
+
+def test_identical_inflight_fetches_are_merged():
+    calls = []
+    release = threading.Event()
+
+    def fetch(ticker, start, end):
+        calls.append(ticker)
+        release.wait(5)
+        return pd.Series([1.0])
+
+    fetcher = TickerFetcher(fetch)
+    first = fetcher.submit("AAPL", START, END)
+    second = fetcher.submit("aapl", START, END)
+    assert first is second
+    release.set()
+    assert first.result().iloc[0] == 1.0
+    assert calls == ["AAPL"]
+
+    # Once finished, the next request fetches again.
+    fetcher.submit("AAPL", START, END).result()
+    assert len(calls) == 2
+
+
+def test_fetch_many_runs_concurrently():
+    def fetch(ticker, start, end):
+        time.sleep(0.2)
+        return pd.Series([1.0])
+
+    fetcher = TickerFetcher(fetch, max_workers=4)
+    began = time.perf_counter()
+    futures = fetcher.fetch_many(["A", "B", "C", "D"], START, END)
+    for future in futures.values():
+        future.result()
+    assert time.perf_counter() - began < 0.6
+
+
+def test_fetch_errors_stay_per_ticker():
+    def fetch(ticker, start, end):
+        if ticker == "BAD":
+            raise ValueError("No data received")
+        return pd.Series([1.0])
+
+    futures = TickerFetcher(fetch).fetch_many(["GOOD", "BAD"], START, END)
+    assert futures["GOOD"].result().iloc[0] == 1.0
+    assert isinstance(futures["BAD"].exception(), ValueError)
@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import numpy as np
+import pandas as pd
+import golden_cross_roi as gc
+
+
+def price_frame():
+    dates = pd.bdate_range("2022-01-03", periods=500)
+    close = 100 * np.exp(np.random.default_rng(0).normal(0, 0.02, len(dates)).cumsum())
+    return pd.DataFrame({"Close": close}, index=dates)
+
+
+def test_evaluate_frame_matches_single_runs():
+    trades, summary = gc.evaluate_frame(price_frame(), "SYN", gc.MA_OPTIONS)
+    assert [row["option"] for row in summary] == list(gc.MA_OPTIONS)
+    for row in summary:
+        df = price_frame()
+        gc.compute_ma(df, row["short"], row["long"])
+        rois = gc.compute_rois(df, gc.pair_trades(*gc.compute_signals(df)))
+        assert row["trades"] == len(rois)
+        assert [t["roi"] for t in trades if t["option"] == row["option"]] == [r[2] for r in rois]
+        if rois:
+            assert np.isclose(row["avg_roi"], np.mean([r[2] for r in rois]))
+
+
+def test_batch_inputs_and_output(tmp_path):
+    tickers = tmp_path / "tickers.txt"
+    tickers.write_text("aapl, msft\n# comment\nGOOG  AAPL\n")
+    assert gc.read_tickers(str(tickers)) == ["AAPL", "MSFT", "GOOG"]
+    assert gc.parse_windows(["5_30", "10_50"]) == {"5_30": (5, 30), "10_50": (10, 50)}
+
+    trades, summary = gc.evaluate_frame(price_frame(), "SYN", {"5_30": (5, 30)})
+    gc.write_table(summary, str(tmp_path / "summary.csv"), gc.SUMMARY_COLUMNS)
+    written = pd.read_csv(tmp_path / "summary.csv")
+    assert list(written["ticker"]) == ["SYN"] and written["trades"][0] == len(trades)
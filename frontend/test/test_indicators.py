@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+import numpy as np
+import crossover
+from indicators import IndicatorEngine, RollingMean
+
+
+def test_rolling_mean_matches_batch():
+    values = np.random.default_rng(0).normal(size=200).cumsum() + 100
+    mean = RollingMean(7)
+    streamed = [mean.update(v) for v in values]
+    expected = crossover.rolling_mean(values, 7)
+    assert streamed[:6] == [None] * 6
+    np.testing.assert_allclose(streamed[6:], expected[6:])
+
+
+def test_engine_positions_match_batch_crossover():
+    prices = 100 * np.exp(np.random.default_rng(1).normal(0, 0.02, 500).cumsum())
+    engine = IndicatorEngine()
+    engine.track("AAA", 5, 20)
+    engine.track("AAA", 10, 20)
+    states = [engine.update("AAA", p) for p in prices]
+
+    for i, (short, long) in enumerate([(5, 20), (10, 20)]):
+        expected = crossover.positions(crossover.rolling_mean(prices, short),
+                                       crossover.rolling_mean(prices, long))
+        got = np.array([s[i]["position"] for s in states])
+        np.testing.assert_array_equal(got, expected)
+        events = [s[i]["event"] for s in states]
+        assert events.count("golden_cross") == np.sum(np.diff(expected, prepend=0) == 1)
+        assert events.count("dead_cross") == np.sum(np.diff(expected, prepend=0) == -1)
+
+
+def test_engine_ignores_untracked_tickers():
+    assert IndicatorEngine().update("NOPE", 1.0) == []
@@ -2,11 +2,41 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
 
-from main import app
+import asyncio
+import json
+import time
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+from cache import ResultCache
+from feeds import ReplayFeed
+from main import (
+    app, data_date, get_backend, get_feed, history_window, CachedBackend, SimulateRequest, StoreBackend,
+    SyntheticBackend,
+)
+from store import PriceStore
 from fastapi.testclient import TestClient
 
 client = TestClient(app)
 
+
+@pytest.fixture(autouse=True, scope="module")
+def offline_backend(tmp_path_factory):
+    """Serve the tests from a seeded local store instead of yfinance."""
+    store = PriceStore(str(tmp_path_factory.mktemp("prices")))
+    start, end = history_window()
+    dates = pd.bdate_range(start, end, inclusive="left")
+    rng = np.random.default_rng(0)
+    for ticker in ["AAPL", "MSFT", "GOOG", "TSLA"]:
+        closes = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(dates))))
+        store.write(ticker, pd.Series(closes, index=dates), start, end)
+    backend = StoreBackend(store)
+    app.dependency_overrides[get_backend] = lambda: backend
+    yield store
+    app.dependency_overrides.clear()
+
 def test_simulate_monthly_success():
     payload = {
         "tickers": ["AAPL"],
@@ -22,8 +52,8 @@ def test_simulate_monthly_success():
     result = data["results"][0]
 
     assert result["ticker"] == "AAPL"
-    assert isinstance(result["final_value"], (float, int, type(None)))
-    assert isinstance(result["prices"], list)
+    assert isinstance(result["final_value"], float)
+    assert set(result["prices"][0]) == {"date", "price"}
 
 def test_simulate_lump_sum_success():
     payload = {
@@ -37,7 +67,7 @@ def test_simulate_lump_sum_success():
     result = data["results"][0]
 
     assert result["ticker"] == "MSFT"
-    assert isinstance(result["final_value"], (float, int, type(None)))
+    assert isinstance(result["final_value"], float)
     assert isinstance(result["prices"], list)
 
 def test_simulate_invalid_strategy():
@@ -60,4 +90,447 @@ def test_simulate_mismatched_lists():
     }
     response = client.post("/simulate", json=payload)
     assert response.status_code == 200
-    assert len(response.json()["results"]) == 1  # zip 때문에 하나만 처리됨
\ No newline at end of file
+    assert len(response.json()["results"]) == 1  # zip 때문에 하나만 처리됨
+
+def test_simulate_unknown_ticker_offline():
+    payload = {
+        "tickers": ["NOPE"],
+        "amounts": [1000],
+        "strategy": "monthly"
+    }
+    response = client.post("/simulate", json=payload)
+    result = response.json()["results"][0]
+    assert result["final_value"] is None
+    assert result["error"] == "No stored data"
+
+def test_volatility_offline():
+    response = client.post("/volatility", json={"tickers": ["AAPL", "GOOG"]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["ticker"] for r in results] == ["AAPL", "GOOG"]
+    for r in results:
+        assert r["min"] <= r["q1"] <= r["median"] <= r["q3"] <= r["max"]
+
+def test_volatility_rolling_and_correlation():
+    payload = {"tickers": ["AAPL", "NOPE", "MSFT"], "rolling_window": 21}
+    results = client.post("/volatility", json=payload).json()["results"]
+    assert results[1] == {"ticker": "NOPE", "error": "No stored data"}
+    rolling = results[0]["rolling_std"]
+    assert len(rolling) > 1000 and all(p["std"] > 0 for p in rolling)
+
+    response = client.post("/correlation", json={"tickers": ["AAPL", "MSFT", "NOPE"]})
+    data = response.json()
+    assert data["tickers"] == ["AAPL", "MSFT"]
+    assert data["errors"] == [{"ticker": "NOPE", "error": "No stored data"}]
+    assert data["correlation"][0][0] == 1.0
+    assert data["correlation"][0][1] == data["correlation"][1][0]
+    assert abs(data["covariance"][0][0] - results[0]["std"] ** 2) < 1e-12
+
+def test_montecarlo_offline():
+    payload = {"tickers": ["AAPL", "NOPE"], "amounts": [12000, 1000], "paths": 2000}
+    results = client.post("/montecarlo", json=payload).json()["results"]
+    assert results[1] == {"ticker": "NOPE", "error": "No stored data"}
+    result = results[0]
+    assert result["percentiles"] == [5, 25, 50, 75, 95]
+    assert result["monthly"] == sorted(result["monthly"])
+    assert 0 <= result["prob_monthly_beats_lump_sum"] <= 1
+
+    both = client.post("/simulate", json={"tickers": ["AAPL"], "amounts": [12000], "strategy": "both"})
+    assert result["historical"] == both.json()["results"][0]["final_values"]
+
+    bad = client.post("/montecarlo", json={**payload, "method": "magic"}).json()["results"]
+    assert bad[0]["error"] == "Invalid method"
+
+    huge = client.post("/montecarlo", json={**payload, "months": 10**8}).json()["results"]
+    assert huge[0]["error"] == "months must be between 2 and 600"
+
+    returns = len(both.json()["results"][0]["prices"]) - 1
+    ok = client.post("/montecarlo", json={**payload, "block_months": returns - 1}).json()["results"]
+    assert "error" not in ok[0]
+    for block in (0, returns, 10**6):
+        bad = client.post("/montecarlo", json={**payload, "block_months": block}).json()["results"]
+        assert bad[0]["error"] == "Invalid block_months"
+
+def test_rolling_start_dates():
+    both = client.post("/simulate", json={"tickers": ["AAPL"], "amounts": [1000], "strategy": "both"})
+    months = len(both.json()["results"][0]["prices"])
+
+    payload = {"tickers": ["AAPL", "NOPE"], "amounts": [1000, 1000],
+               "horizon_months": 12, "years": 5}
+    results = client.post("/rolling", json=payload).json()["results"]
+    assert results[1] == {"ticker": "NOPE", "error": "No stored data"}
+    assert len(results[0]["starts"]) == months - 11
+    assert results[0]["summary"]["monthly"] == sorted(results[0]["summary"]["monthly"])
+
+    # A horizon spanning the whole history has one start: the /simulate result.
+    payload["horizon_months"] = months
+    full = client.post("/rolling", json=payload).json()["results"][0]["starts"]
+    final_values = both.json()["results"][0]["final_values"]
+    assert [(s["monthly"], s["lump_sum"]) for s in full] == [
+        (final_values["monthly"], final_values["lump_sum"])
+    ]
+
+    payload["horizon_months"] = months + 1
+    too_long = client.post("/rolling", json=payload).json()["results"][0]
+    assert too_long["error"] == "Horizon is longer than the price history"
+
+    for horizon in (0, -5):
+        payload["horizon_months"] = horizon
+        results = client.post("/rolling", json=payload).json()["results"]
+        assert results == [{"ticker": t, "error": "Invalid horizon_months"} for t in ("AAPL", "NOPE")]
+
+def test_portfolio_backtest():
+    payload = {"tickers": ["AAPL", "MSFT"], "weights": [3, 1], "amount": 1000}
+    held = client.post("/portfolio", json=payload).json()
+    assert held["rebalances"] == 0 and held["turnover"] == 0
+    assert [a["target_weight"] for a in held["assets"]] == [0.75, 0.25]
+
+    monthly = client.post("/portfolio", json={**payload, "rebalance": "monthly"}).json()
+    assert monthly["rebalances"] >= 58
+    assert monthly["start_date"] == held["start_date"]
+    assert monthly["values"][0]["price"] == 1000
+    assert monthly["max_drawdown"] <= 0
+
+    missing = client.post("/portfolio", json={"tickers": ["AAPL", "NOPE"]}).json()
+    assert missing["errors"] == [{"ticker": "NOPE", "error": "No stored data"}]
+    bad = client.post("/portfolio", json={**payload, "rebalance": "weekly"}).json()
+    assert bad["error"] == "Invalid rebalance"
+    for threshold in (0, -0.1, 1, 2):
+        bad = client.post("/portfolio", json={**payload, "rebalance": "threshold",
+                                              "threshold": threshold}).json()
+        assert bad["error"] == "Invalid threshold"
+    # The threshold only matters when rebalancing on it.
+    monthly = client.post("/portfolio", json={**payload, "rebalance": "monthly", "threshold": 1}).json()
+    assert "error" not in monthly
+
+def test_simulate_max_points_downsamples_charts_only():
+    payload = {"tickers": ["AAPL"], "amounts": [1000], "strategy": "ma_crossover",
+               "short_window": 3, "long_window": 8}
+    full = client.post("/simulate", json=payload).json()["results"][0]
+    small = client.post("/simulate", json={**payload, "max_points": 20}).json()["results"][0]
+    assert small["final_value"] == full["final_value"]
+    assert len(small["prices"]) == len(small["ma_data"]) < len(full["prices"])
+
+    # Every crossover survives downsampling.
+    def crosses(result):
+        return {p["date"] for p, prev in zip(result["ma_data"][1:], result["ma_data"])
+                if None not in (p["short"], p["long"], prev["short"], prev["long"])
+                and (p["short"] > p["long"]) != (prev["short"] > prev["long"])}
+    shown_dates = {p["date"] for p in small["prices"]}
+    assert crosses(full) <= shown_dates
+    prices = [p["price"] for p in full["prices"]]
+    shown = [p["price"] for p in small["prices"]]
+    assert max(prices) in shown and min(prices) in shown
+
+    columnar = client.post("/simulate", json={**payload, "max_points": 20, "format": "columnar"})
+    result = columnar.json()["results"][0]
+    assert len(result["prices"]["dates"]) == len(small["prices"])
+
+def test_max_points_series_merge_by_date_across_tickers():
+    payload = {"tickers": ["AAPL", "MSFT"], "amounts": [1000, 1000], "strategy": "ma_crossover",
+               "short_window": 3, "long_window": 8}
+    full = client.post("/simulate", json=payload).json()["results"]
+    small = client.post("/simulate", json={**payload, "max_points": 15}).json()["results"]
+
+    # Tickers keep different points, so charts must merge them by date,
+    # as StrategySimulator does; every merged value must be the full one.
+    merged = {}
+    for result in small:
+        assert [p["date"] for p in result["prices"]] == [m["date"] for m in result["ma_data"]]
+        for p in result["prices"]:
+            merged.setdefault(p["date"], {})[result["ticker"]] = p["price"]
+    assert {p["date"] for p in small[0]["prices"]} != {p["date"] for p in small[1]["prices"]}
+    for result in full:
+        prices = {p["date"]: p["price"] for p in result["prices"]}
+        for date, row in merged.items():
+            if result["ticker"] in row:
+                assert row[result["ticker"]] == prices[date]
+
+def test_sweep_rejects_invalid_windows():
+    payload = {"tickers": ["AAPL"], "long_windows": {"start": 6, "stop": 13}}
+    for short_windows in ({"start": 0, "stop": 4}, {"start": -3, "stop": 2},
+                          {"start": 5, "stop": 5}, {"start": 2, "stop": 8, "step": -1},
+                          {"start": 2, "stop": 8, "step": 0}):
+        results = client.post("/sweep", json={**payload, "short_windows": short_windows}).json()
+        assert results["results"] == [{"ticker": "AAPL", "error": "Invalid windows"}]
+
+def test_sweep_bounds_grid_size_and_windows():
+    payload = {"tickers": ["AAPL", "MSFT"], "short_windows": {"start": 1, "stop": 100000},
+               "long_windows": {"start": 6, "stop": 13}}
+    results = client.post("/sweep", json=payload).json()["results"]
+    assert results == [{"ticker": t, "error": "At most 500 windows per axis"}
+                       for t in ("AAPL", "MSFT")]
+
+    payload = {"tickers": ["AAPL"], "short_windows": {"start": 3, "stop": 4},
+               "long_windows": {"start": 50, "stop": 501, "step": 450}}
+    results = client.post("/sweep", json=payload).json()["results"]
+    assert results == [{"ticker": "AAPL", "error": "Windows longer than the price history"}]
+
+def test_sweep_matches_simulate():
+    payload = {
+        "tickers": ["AAPL", "MSFT", "NOPE"],
+        "short_windows": {"start": 2, "stop": 8, "step": 2},
+        "long_windows": {"start": 6, "stop": 13, "step": 3},
+    }
+    response = client.post("/sweep", json=payload)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[2] == {"ticker": "NOPE", "error": "No stored data"}
+
+    heatmap = results[0]
+    assert heatmap["short_windows"] == [2, 4, 6]
+    assert heatmap["long_windows"] == [6, 9, 12]
+    assert heatmap["roi"][2][0] is None  # short 6 is not below long 6
+
+    simulated = client.post("/simulate", json={
+        "tickers": ["AAPL"],
+        "amounts": [1000],
+        "strategy": "ma_crossover",
+        "short_window": 4,
+        "long_window": 9,
+    }).json()["results"][0]
+    assert abs(heatmap["roi"][1][1] - (simulated["final_value"] / 1000 - 1) * 100) < 0.01
+
+class SlowBackend(StoreBackend):
+    """Store backend whose SLOW ticker takes far longer than the timeouts."""
+
+    def close_prices(self, ticker, start, end):
+        if ticker == "SLOW":
+            time.sleep(1)
+        return super().close_prices(ticker, start, end)
+
+def test_simulate_async_returns_partial_results(offline_backend):
+    backend = SlowBackend(offline_backend)
+    data = SimulateRequest(tickers=["AAPL", "SLOW"], amounts=[1000, 1000], strategy="monthly")
+    began = time.perf_counter()
+    results = asyncio.run(backend.simulate_async(data, ticker_timeout=0.2))["results"]
+    assert time.perf_counter() - began < 0.8
+    assert isinstance(results[0]["final_value"], float)
+    assert results[1]["error"] == "Timed out fetching data"
+
+    results = asyncio.run(backend.simulate_async(data, deadline=0.2))["results"]
+    assert isinstance(results[0]["final_value"], float)
+    assert results[1] == {
+        "ticker": "SLOW",
+        "final_value": None,
+        "prices": [],
+        "error": "Request deadline exceeded",
+    }
+
+def test_simulate_stream_reports_deadline(offline_backend):
+    backend = SlowBackend(offline_backend)
+    data = SimulateRequest(tickers=["AAPL", "SLOW"], amounts=[1000, 1000], strategy="monthly")
+    results = {r["ticker"]: r for r in backend.simulate_stream(data, deadline=0.2)}
+    assert isinstance(results["AAPL"]["final_value"], float)
+    assert results["SLOW"]["error"] == "Request deadline exceeded"
+
+def test_simulate_stream_ndjson():
+    payload = {
+        "tickers": ["AAPL", "NOPE", "MSFT"],
+        "amounts": [1000, 1000, 1000],
+        "strategy": "lump_sum"
+    }
+    response = client.post("/simulate/stream", json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    streamed = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(r["ticker"] for r in streamed) == ["AAPL", "MSFT", "NOPE"]
+
+    expected = client.post("/simulate", json=payload).json()["results"]
+    by_ticker = {r["ticker"]: r for r in streamed}
+    for result in expected:
+        assert by_ticker[result["ticker"]] == result
+
+def test_simulate_stream_sse():
+    payload = {"tickers": ["AAPL"], "amounts": [1000], "strategy": "monthly"}
+    response = client.post(
+        "/simulate/stream", json=payload, headers={"Accept": "text/event-stream"}
+    )
+    assert response.headers["content-type"].startswith("text/event-stream")
+    event = response.text.split("\n\n")[0]
+    assert event.startswith("data: ")
+    assert json.loads(event[len("data: "):])["ticker"] == "AAPL"
+
+def test_simulate_columnar_matches_records():
+    payload = {
+        "tickers": ["AAPL"],
+        "amounts": [1000],
+        "strategy": "ma_crossover",
+        "short_window": 3,
+        "long_window": 12,
+    }
+    records = client.post("/simulate", json=payload).json()["results"][0]
+    columnar = client.post(
+        "/simulate", json={**payload, "format": "columnar"}
+    ).json()["results"][0]
+
+    assert columnar["final_value"] == records["final_value"]
+    prices = columnar["prices"]
+    assert prices["price"] == [p["price"] for p in records["prices"]]
+    months = pd.to_datetime(prices["dates"], unit="s").strftime("%Y-%m").tolist()
+    assert months == [p["date"] for p in records["prices"]]
+    assert columnar["ma_data"]["short"] == [m["short"] for m in records["ma_data"]]
+    assert columnar["ma_data"]["long"][0] is None
+
+def test_simulate_response_is_gzipped():
+    payload = {"tickers": ["AAPL", "MSFT"], "amounts": [1000, 1000], "strategy": "monthly"}
+    response = client.post("/simulate", json=payload, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["results"]) == 2
+
+def test_simulate_arrow():
+    pa = pytest.importorskip("pyarrow")
+    payload = {"tickers": ["AAPL", "NOPE"], "amounts": [1000, 1000], "strategy": "lump_sum"}
+    response = client.post(
+        "/simulate", json=payload,
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+    )
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert set(table.column("ticker").to_pylist()) == {"AAPL"}
+    summary = json.loads(table.schema.metadata[b"results"])
+    assert summary[1] == {"ticker": "NOPE", "final_value": None, "error": "No stored data"}
+
+class CountingBackend(StoreBackend):
+    """Store backend that records which tickers it had to load."""
+
+    def __init__(self, store):
+        super().__init__(store)
+        self.loaded = []
+
+    def close_prices(self, ticker, start, end):
+        self.loaded.append(ticker)
+        return super().close_prices(ticker, start, end)
+
+def test_cached_backend_only_computes_misses(offline_backend):
+    inner = CountingBackend(offline_backend)
+    backend = CachedBackend(inner, ResultCache())
+    data = SimulateRequest(tickers=["AAPL"], amounts=[1000], strategy="monthly")
+    first = backend.simulate(data)["results"]
+    assert inner.loaded == ["AAPL"]
+
+    data = SimulateRequest(tickers=["AAPL", "MSFT", "NOPE"], amounts=[1000] * 3, strategy="monthly")
+    results = asyncio.run(backend.simulate_async(data))["results"]
+    assert results[0] == first[0]
+    assert inner.loaded == ["AAPL", "MSFT", "NOPE"]
+
+    streamed = list(backend.simulate_stream(data))
+    assert sorted(r["ticker"] for r in streamed) == ["AAPL", "MSFT", "NOPE"]
+    # Errors are not cached, so only the unknown ticker is retried.
+    assert inner.loaded == ["AAPL", "MSFT", "NOPE", "NOPE"]
+
+    other = SimulateRequest(tickers=["AAPL"], amounts=[2000], strategy="monthly")
+    backend.simulate(other)
+    assert inner.loaded[-1] == "AAPL"
+
+def test_etag_not_modified():
+    payload = {"tickers": ["AAPL"], "amounts": [1000], "strategy": "monthly"}
+    response = client.post("/simulate", json=payload)
+    etag = response.headers["etag"]
+    again = client.post("/simulate", json=payload, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    changed = client.post(
+        "/simulate", json={**payload, "amounts": [2000]}, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+
+    response = client.post("/volatility", json={"tickers": ["AAPL"]})
+    etag = response.headers["etag"]
+    again = client.post("/volatility", json={"tickers": ["AAPL"]}, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+
+def test_data_date_matches_fetch_window(monkeypatch):
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    try:
+        # 17:00 New York on Friday: the close has passed, but fetches ending
+        # at the local date (Friday) only include Thursday's bar.
+        assert data_date(datetime(2024, 3, 8, 22, tzinfo=timezone.utc)) == date(2024, 3, 7)
+        # After local midnight Friday's bar is fetched and keys move with it.
+        assert data_date(datetime(2024, 3, 9, 1, tzinfo=timezone.utc)) == date(2024, 3, 8)
+        # Before Monday's close the last bar is still Friday's.
+        assert data_date(datetime(2024, 3, 11, 15, tzinfo=timezone.utc)) == date(2024, 3, 8)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+def test_failed_results_get_no_etag(offline_backend, monkeypatch):
+    import main
+    monkeypatch.setattr(main, "TICKER_TIMEOUT", 0.2)
+    monkeypatch.setitem(app.dependency_overrides, get_backend,
+                        lambda: SlowBackend(offline_backend))
+    timed_out = client.post("/volatility", json={"tickers": ["SLOW"]})
+    monkeypatch.undo()
+    assert timed_out.json()["results"][0]["error"] == "Timed out fetching data"
+    assert "etag" not in timed_out.headers
+
+    payload = {"tickers": ["AAPL", "NOPE"], "amounts": [1000, 1000], "strategy": "monthly"}
+    response = client.post("/simulate", json=payload)
+    assert response.json()["results"][1]["error"] == "No stored data"
+    assert "etag" not in response.headers
+
+    requests = [
+        ("/volatility", {"tickers": ["AAPL", "NOPE"]}),
+        ("/correlation", {"tickers": ["AAPL", "NOPE"]}),
+        ("/montecarlo", {"tickers": ["NOPE"], "amounts": [1000], "paths": 10}),
+        ("/rolling", {"tickers": ["NOPE"], "amounts": [1000], "years": 5}),
+        ("/portfolio", {"tickers": ["AAPL", "NOPE"]}),
+    ]
+    for path, body in requests:
+        assert "etag" not in client.post(path, json=body).headers, path
+    assert "etag" in client.post("/correlation", json={"tickers": ["AAPL"]}).headers
+
+def test_synthetic_backend_is_deterministic():
+    start, end = history_window()
+    first = SyntheticBackend(seed=1).close_prices("AAPL", start, end)
+    assert first.equals(SyntheticBackend(seed=1).close_prices("AAPL", start, end))
+    assert not first.equals(SyntheticBackend(seed=1).close_prices("MSFT", start, end))
+    assert (first.index.dayofweek < 5).all()
+
+    data = SimulateRequest(tickers=["AAPL"], amounts=[1000], strategy="both")
+    results = SyntheticBackend(seed=1).simulate(data)["results"]
+    assert set(results[0]["final_values"]) == {"monthly", "lump_sum"}
+
+def test_server_timing_and_metrics():
+    payload = {"tickers": ["AAPL", "NOPE"], "amounts": [1000, 1000], "strategy": "both"}
+    response = client.post("/simulate", json=payload)
+    stages = {part.split(";")[0] for part in response.headers["server-timing"].split(", ")}
+    assert {"fetch", "store", "resample", "strategy", "series", "serialize", "total"} <= stages
+
+    text = client.get("/metrics").text
+    assert 'request_duration_seconds_count{endpoint="/simulate",strategy="both"}' in text
+    assert 'stage_duration_seconds_bucket{endpoint="/simulate",strategy="both",stage="resample",le="+Inf"}' in text
+    assert 'tickers_processed_total{endpoint="simulate",outcome="error"}' in text
+    assert "fetch_errors_total" in text
+
+def test_server_timing_covers_inline_sweep():
+    payload = {"tickers": ["AAPL"], "short_windows": {"start": 2, "stop": 12},
+               "long_windows": {"start": 12, "stop": 40}}
+    response = client.post("/sweep", json=payload)
+    timings = dict(part.split(";dur=") for part in response.headers["server-timing"].split(", "))
+    assert float(timings["sweep"]) > 0
+
+def test_signals_websocket_replays_bars(tmp_path):
+    path = tmp_path / "bars.csv"
+    prices = [10, 10, 10, 10, 12, 14, 16, 12, 8, 6]
+    rows = [f"2024-01-{day:02d},AAPL,{price}" for day, price in enumerate(prices, 1)]
+    path.write_text("date,ticker,close\n" + "\n".join(rows) + "\n")
+    app.dependency_overrides[get_feed] = lambda: ReplayFeed(str(path))
+    try:
+        with client.websocket_connect("/ws/signals?tickers=aapl,MSFT&short=2&long=4") as ws:
+            assert ws.receive_json() == {"type": "snapshot", "results": []}
+            messages = [ws.receive_json() for _ in prices]
+    finally:
+        del app.dependency_overrides[get_feed]
+
+    assert all(m["type"] == "bar" and m["ticker"] == "AAPL" for m in messages)
+    assert messages[2]["long"] is None and messages[3]["long"] == 10
+    events = [(m["date"], m["event"]) for m in messages if m["event"]]
+    assert events == [("2024-01-05", "golden_cross"), ("2024-01-09", "dead_cross")]
+
+def test_metrics_label_unknown_paths_as_unmatched():
+    for path in ("/scan/0", "/scan/1"):
+        assert client.get(path).status_code == 404
+    text = client.get("/metrics").text
+    assert 'request_duration_seconds_count{endpoint="unmatched",strategy=""}' in text
+    assert "/scan/" not in text
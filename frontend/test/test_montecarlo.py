@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+import montecarlo
+
+
+def test_final_values_match_monthly_and_lump_sum_loops():
+    paths = np.random.default_rng(0).normal(0.005, 0.05, (3, 11))
+    dca, lump = montecarlo.final_values(paths, 1200)
+    for path, d, l in zip(paths, dca, lump):
+        prices = np.exp(np.concatenate(([0.0], np.cumsum(path))))
+        shares = sum(1200 / len(prices) / p for p in prices)
+        assert np.isclose(d, shares * prices[-1])
+        assert np.isclose(l, 1200 / prices[0] * prices[-1])
+
+
+def test_bootstrap_draws_contiguous_blocks():
+    history = np.arange(100, dtype=float)
+    rng = np.random.default_rng(0)
+    paths = montecarlo.sample_paths(history, 50, 30, "bootstrap", 12, rng)
+    assert paths.shape == (50, 30)
+    # Inside a block each return follows its predecessor in the history.
+    for block_start in (0, 12, 24):
+        block = paths[:, block_start:block_start + 12]
+        assert (np.diff(block, axis=1) == 1).all()
+
+
+def test_simulate_is_reproducible_across_executors():
+    history = np.random.default_rng(1).normal(0.005, 0.05, 59)
+    args = (history, 1000, 5000, 59)
+    inline = montecarlo.simulate(*args, seed=3, max_cells=1 << 16)
+    with ThreadPoolExecutor(4) as pool:
+        pooled = montecarlo.simulate(*args, seed=3, executor=pool, max_cells=1 << 16)
+    assert inline == pooled
+    assert inline["monthly"] == sorted(inline["monthly"])
+    assert 0 <= inline["prob_monthly_beats_lump_sum"] <= 1
+
+
+def test_simulate_rejects_paths_longer_than_a_chunk():
+    history = np.random.default_rng(1).normal(0.005, 0.05, 59)
+    with pytest.raises(ValueError):
+        montecarlo.simulate(history, 1000, 10, 1 << 17, max_cells=1 << 16)
@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+import numpy as np
+import pandas as pd
+import portfolio
+
+
+def random_prices(days=500, assets=4):
+    rng = np.random.default_rng(0)
+    return 100 * np.exp(rng.normal(0, 0.02, (days, assets)).cumsum(axis=0))
+
+
+def loop_backtest(prices, weights, amount, rebalance_when):
+    """Day-by-day reference: hold shares, reset them when asked to."""
+    shares = weights * amount / prices[0]
+    values, rebalances = [], []
+    for t, row in enumerate(prices):
+        held = shares * row
+        if t > 0 and rebalance_when(t, held):
+            shares = weights * held.sum() / row
+            rebalances.append(t)
+        values.append(held.sum())
+    return np.array(values), rebalances
+
+
+def test_periodic_backtest_matches_loop():
+    prices = random_prices()
+    weights = np.array([0.4, 0.3, 0.2, 0.1])
+    dates = pd.bdate_range("2020-01-01", periods=len(prices))
+    starts = portfolio.period_starts(dates, "monthly")
+    result = portfolio.backtest(prices, weights, 1000, starts)
+    values, rebalances = loop_backtest(prices, weights, 1000, lambda t, _: t in set(starts))
+    np.testing.assert_allclose(result["value"], values)
+    assert list(result["rebalances"]) == rebalances
+    assert (dates[starts].day <= 3).all()
+
+
+def test_threshold_rebalancing_matches_loop():
+    prices = random_prices()
+    weights = np.array([0.4, 0.3, 0.2, 0.1])
+    # A small block forces the search to cross block boundaries.
+    starts = portfolio.threshold_starts(prices, weights, 0.03, block=7)
+    drifted = lambda t, held: (np.abs(held / held.sum() - weights) > 0.03).any()
+    values, rebalances = loop_backtest(prices, weights, 1000, drifted)
+    assert list(starts) == rebalances
+    np.testing.assert_allclose(portfolio.backtest(prices, weights, 1000, starts)["value"], values)
+
+
+def test_buy_and_hold_has_no_turnover():
+    prices = random_prices()
+    result = portfolio.backtest(prices, np.full(4, 0.25), 1000, np.array([], dtype=int))
+    np.testing.assert_allclose(result["value"], (250 / prices[0] * prices).sum(axis=1))
+    assert result["turnover"].size == 0
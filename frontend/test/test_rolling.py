@@ -0,0 +1,22 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+import numpy as np
+import pytest
+import rolling
+
+
+def test_start_dates_match_per_window_loop():
+    prices = 100 * np.exp(np.random.default_rng(0).normal(0.005, 0.05, 40).cumsum())
+    monthly, lump_sum = rolling.start_dates(prices, 12, 1200)
+    assert len(monthly) == len(lump_sum) == 29
+    for s in range(29):
+        window = prices[s:s + 12]
+        assert np.isclose(monthly[s], (100 / window).sum() * window[-1])
+        assert np.isclose(lump_sum[s], 1200 / window[0] * window[-1])
+
+
+def test_start_dates_rejects_long_horizon():
+    with pytest.raises(ValueError):
+        rolling.start_dates(np.ones(5), 6, 100)
@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from datetime import date
+
+import pandas as pd
+from store import PriceStore
+
+
+def make_fetcher(calls, split=None):
+    """Closes that rise one unit per day; after ``split`` (a date and a
+    ratio) every close is divided by the ratio, as adjusted data would be."""
+    def fetch(ticker, start, end):
+        calls.append((start, end))
+        dates = pd.bdate_range(start, end, inclusive="left")
+        closes = pd.Series(100.0 + dates.dayofyear, index=dates)
+        if split is not None:
+            day, ratio = split
+            closes[closes.index < pd.Timestamp(day)] /= ratio
+        return closes
+    return fetch
+
+
+def test_refresh_fetches_only_missing_tail(tmp_path):
+    store = PriceStore(str(tmp_path))
+    calls = []
+    fetch = make_fetcher(calls)
+
+    first = store.refresh("AAPL", date(2024, 1, 1), date(2024, 2, 1), fetch)
+    assert calls == [(date(2024, 1, 1), date(2024, 2, 1))]
+    assert first.index[0] == pd.Timestamp("2024-01-01")
+
+    again = store.refresh("AAPL", date(2024, 1, 1), date(2024, 2, 1), fetch)
+    assert len(calls) == 1
+    pd.testing.assert_series_equal(first, again)
+
+    longer = store.refresh("AAPL", date(2024, 1, 1), date(2024, 2, 15), fetch)
+    # The tail fetch re-reads the last stored bar to detect adjustments.
+    assert calls[-1] == (date(2024, 1, 31), date(2024, 2, 15))
+    assert longer.index[-1] == pd.Timestamp("2024-02-14")
+    assert store.coverage("AAPL") == (date(2024, 1, 1), date(2024, 2, 15))
+
+
+def test_refresh_extends_head(tmp_path):
+    store = PriceStore(str(tmp_path))
+    calls = []
+    fetch = make_fetcher(calls)
+    store.refresh("MSFT", date(2024, 2, 1), date(2024, 3, 1), fetch)
+    closes = store.refresh("MSFT", date(2024, 1, 1), date(2024, 3, 1), fetch)
+    assert calls[-1] == (date(2024, 1, 1), date(2024, 2, 2))
+    assert closes.index.is_monotonic_increasing
+    assert closes.index[0] == pd.Timestamp("2024-01-01")
+
+
+def test_empty_fetch_is_not_recorded(tmp_path):
+    store = PriceStore(str(tmp_path))
+    empty = lambda ticker, start, end: pd.Series(dtype=float)
+    closes = store.refresh("NOPE", date(2024, 1, 1), date(2024, 2, 1), empty)
+    assert closes.empty
+    assert store.coverage("NOPE") is None
+
+
+def test_split_between_refreshes_refetches_history(tmp_path):
+    store = PriceStore(str(tmp_path))
+    calls = []
+    store.refresh("NVDA", date(2024, 1, 1), date(2024, 2, 1), make_fetcher(calls))
+
+    # A 4:1 split on Feb 5 rewrites every earlier adjusted close.
+    split = make_fetcher(calls, split=(date(2024, 2, 5), 4.0))
+    closes = store.refresh("NVDA", date(2024, 1, 1), date(2024, 2, 15), split)
+    assert calls[-1] == (date(2024, 1, 1), date(2024, 2, 15))
+    expected = split("NVDA", date(2024, 1, 1), date(2024, 2, 15))
+    assert list(closes.index) == list(expected.index)
+    assert list(closes) == list(expected)
+    assert closes.pct_change().min() > -0.5
+    assert store.coverage("NVDA") == (date(2024, 1, 1), date(2024, 2, 15))
@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+import numpy as np
+import pandas as pd
+import volatility
+
+
+def ragged_closes():
+    """Tickers trading on different subsets of the same business days."""
+    rng = np.random.default_rng(0)
+    days = pd.bdate_range("2020-01-01", periods=300)
+    closes = {}
+    for i in range(4):
+        index = days[rng.random(len(days)) > 0.1 * i]
+        closes[f"T{i}"] = pd.Series(
+            100 * np.exp(rng.normal(0, 0.02, len(index)).cumsum()), index=index
+        )
+    return closes
+
+
+def test_statistics_match_per_ticker_pandas():
+    closes = ragged_closes()
+    dates, matrix = volatility.align(closes)
+    returns = volatility.daily_returns(matrix)
+    stats = volatility.box_stats(returns)
+    rolling = volatility.rolling_std(returns, 20)
+
+    for j, series in enumerate(closes.values()):
+        expected = series.pct_change().dropna()
+        assert np.isclose(stats["q1"][j], expected.quantile(0.25))
+        assert np.isclose(stats["median"][j], expected.median())
+        assert np.isclose(stats["std"][j], expected.std())
+        got = pd.Series(rolling[:, j], index=dates).dropna()
+        pd.testing.assert_series_equal(got, expected.rolling(20).std().dropna(),
+                                       check_names=False, check_freq=False)
+
+
+def test_covariance_matches_pairwise_pandas():
+    dates, matrix = volatility.align(ragged_closes())
+    returns = volatility.daily_returns(matrix)
+    cov, corr = volatility.covariance(returns)
+    frame = pd.DataFrame(returns, index=dates)
+    np.testing.assert_allclose(cov, frame.cov().to_numpy())
+    np.testing.assert_allclose(corr, frame.corr().to_numpy())
+    np.testing.assert_allclose(np.diag(corr), 1.0)
@@ -1,61 +1,65 @@
 import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import yfinance as yf
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+import crossover
+
 MA_OPTIONS = {
     "10_50": (10, 50),
     "20_60": (20, 60),
     "50_200": (50, 200),
 }
 
+TRADE_COLUMNS = ["ticker", "option", "buy_date", "sell_date", "roi"]
+SUMMARY_COLUMNS = ["ticker", "option", "short", "long", "trades", "avg_roi", "total_roi",
+                   "win_rate", "error"]
+
 def download_data(ticker: str) -> pd.DataFrame:
     """Download historical price data."""
-    return yf.download(ticker, start="2022-01-01", end="2024-01-01", progress=False)
+    df = yf.download(ticker, start="2022-01-01", end="2024-01-01", progress=False)
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    return df
 
 def compute_ma(df: pd.DataFrame, short: int, long: int) -> None:
     """Add moving average columns."""
-    df["MA_short"] = df["Close"].rolling(window=short).mean()
-    df["MA_long"] = df["Close"].rolling(window=long).mean()
+    close = df["Close"].to_numpy()
+    df["MA_short"] = crossover.rolling_mean(close, short)
+    df["MA_long"] = crossover.rolling_mean(close, long)
 
 def compute_signals(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     """Return golden and dead cross points."""
-    df["Signal"] = 0
-    df.loc[df["MA_short"] > df["MA_long"], "Signal"] = 1
-    df["Crossover"] = df["Signal"].diff()
-    golden = df[df["Crossover"] == 1]
-    dead = df[df["Crossover"] == -1]
-    return golden, dead
+    signal = (df["MA_short"].to_numpy() > df["MA_long"].to_numpy()).astype(np.int8)
+    df["Signal"] = signal
+    golden, dead = crossover.cross_points(signal)
+    return df.iloc[golden], df.iloc[dead]
 
 def pair_trades(golden: pd.DataFrame, dead: pd.DataFrame) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
     """Pair buy and sell dates for ROI calculation."""
-    buy_dates = golden.index
-    sell_dates = dead.index
-    if len(buy_dates) == 0:
-        return []
-    sell_dates = sell_dates[sell_dates > buy_dates[0]]
-    pairs = []
-    for buy_date in buy_dates:
-        valid = sell_dates[sell_dates > buy_date]
-        if len(valid) == 0:
-            break
-        sell_date = valid[0]
-        pairs.append((buy_date, sell_date))
-        sell_dates = sell_dates[sell_dates > sell_date]
-    return pairs
+    buys, sells = crossover.pair_trades(golden.index.values, dead.index.values)
+    return list(zip(golden.index[buys], dead.index[sells]))
 
 def compute_rois(df: pd.DataFrame, pairs: list[tuple[pd.Timestamp, pd.Timestamp]]) -> list[tuple[pd.Timestamp, pd.Timestamp, float]]:
     """Compute ROI for each trade pair."""
-    rois = []
-    for buy_date, sell_date in pairs:
-        buy_price = df.loc[buy_date, "Close"]
-        sell_price = df.loc[sell_date, "Close"]
-        roi = (sell_price - buy_price) / buy_price * 100
-        rois.append((buy_date, sell_date, roi))
-    return rois
+    if not pairs:
+        return []
+    buy_dates, sell_dates = map(list, zip(*pairs))
+    positions = df.index.get_indexer(buy_dates), df.index.get_indexer(sell_dates)
+    rois = crossover.trade_returns(df["Close"].to_numpy(), *positions) * 100
+    return [(b, s, float(r)) for b, s, r in zip(buy_dates, sell_dates, rois)]
 
 def plot(df: pd.DataFrame, golden: pd.DataFrame, dead: pd.DataFrame, short: int, long: int, ticker: str) -> None:
     """Visualise price, moving averages and crossovers."""
+    # Imported here so batch runs never pay for loading matplotlib.
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(14, 6))
     plt.plot(df["Close"], label="Close Price", alpha=0.5)
     plt.plot(df["MA_short"], label=f"MA{short}", linestyle="--")
@@ -70,16 +74,121 @@ def plot(df: pd.DataFrame, golden: pd.DataFrame, dead: pd.DataFrame, short: int,
     plt.tight_layout()
     plt.show()
 
+def evaluate_frame(df: pd.DataFrame, ticker: str, windows: dict[str, tuple[int, int]]) -> tuple[list[dict], list[dict]]:
+    """Per-trade and summary ROI rows for every window pair on one ticker."""
+    trades, summary = [], []
+    for option, (short, long) in windows.items():
+        compute_ma(df, short, long)
+        golden, dead = compute_signals(df)
+        rois = compute_rois(df, pair_trades(golden, dead))
+        for buy_date, sell_date, roi in rois:
+            trades.append({"ticker": ticker, "option": option, "buy_date": buy_date,
+                           "sell_date": sell_date, "roi": roi})
+        values = np.array([r[2] for r in rois])
+        summary.append({
+            "ticker": ticker,
+            "option": option,
+            "short": short,
+            "long": long,
+            "trades": len(rois),
+            "avg_roi": float(values.mean()) if len(values) else np.nan,
+            "total_roi": float((np.prod(1 + values / 100) - 1) * 100) if len(values) else np.nan,
+            "win_rate": float((values > 0).mean()) if len(values) else np.nan,
+            "error": None,
+        })
+    return trades, summary
+
+def evaluate_ticker(ticker: str, windows: dict[str, tuple[int, int]]) -> tuple[list[dict], list[dict]]:
+    """Download one ticker and evaluate it; failures become summary rows."""
+    try:
+        df = download_data(ticker)
+        if df.empty:
+            raise ValueError("Failed to download data")
+        return evaluate_frame(df, ticker, windows)
+    except Exception as e:
+        return [], [{"ticker": ticker, "option": option, "short": short, "long": long,
+                     "trades": 0, "avg_roi": np.nan, "total_roi": np.nan,
+                     "win_rate": np.nan, "error": str(e)}
+                    for option, (short, long) in windows.items()]
+
+def read_tickers(path: str) -> list[str]:
+    """Tickers from a file, separated by whitespace or commas; ``#`` starts a comment."""
+    tickers = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0]
+            tickers.extend(t.upper() for t in line.replace(",", " ").split())
+    return list(dict.fromkeys(tickers))
+
+def parse_windows(specs: list[str]) -> dict[str, tuple[int, int]]:
+    """Turn ``SHORT_LONG`` strings such as ``5_30`` into a window mapping."""
+    windows = {}
+    for spec in specs:
+        short, _, long = spec.partition("_")
+        if not (short.isdigit() and long.isdigit()) or not 0 < int(short) < int(long):
+            raise argparse.ArgumentTypeError(f"Invalid window pair: {spec}")
+        windows[spec] = (int(short), int(long))
+    return windows
+
+def write_table(rows: list[dict], path: str, columns: list[str]) -> None:
+    frame = pd.DataFrame(rows, columns=columns)
+    if path.endswith(".parquet"):
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+def run_batch(tickers: list[str], windows: dict[str, tuple[int, int]], output: str,
+              workers: int | None = None) -> tuple[str, str]:
+    """Evaluate every ticker on a process pool and write trade and summary tables.
+
+    ``output`` names the summary file; trades go next to it with a
+    ``_trades`` suffix. The extension picks CSV or Parquet.
+    """
+    trades, summary = [], []
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        for ticker_trades, ticker_summary in pool.map(evaluate_ticker, tickers, repeat(windows)):
+            trades.extend(ticker_trades)
+            summary.extend(ticker_summary)
+    stem, ext = os.path.splitext(output)
+    trades_path = f"{stem}_trades{ext or '.csv'}"
+    write_table(summary, output, SUMMARY_COLUMNS)
+    write_table(trades, trades_path, TRADE_COLUMNS)
+    return output, trades_path
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Calculate ROI based on moving average crossovers")
-    parser.add_argument("ticker", help="Ticker symbol")
+    parser.add_argument("ticker", nargs="?", help="Ticker symbol")
     parser.add_argument(
         "--option",
         choices=list(MA_OPTIONS.keys()),
         default="20_60",
         help="Moving average combination to use",
     )
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Evaluate every ticker listed in FILE without plotting")
+    parser.add_argument("--windows", nargs="+", metavar="SHORT_LONG",
+                        help="Window pairs for --batch (default: all of MA_OPTIONS)")
+    parser.add_argument("--output", default="golden_cross_roi.csv",
+                        help="Summary file for --batch; .parquet writes Parquet")
+    parser.add_argument("--workers", type=int, help="Worker processes for --batch")
+    parser.add_argument("--no-plot", action="store_true", help="Skip the chart")
     args = parser.parse_args()
+
+    if args.batch:
+        try:
+            windows = parse_windows(args.windows) if args.windows else MA_OPTIONS
+        except argparse.ArgumentTypeError as e:
+            parser.error(str(e))
+        summary_path, trades_path = run_batch(
+            read_tickers(args.batch), windows, args.output, args.workers
+        )
+        print("Summary written to", summary_path)
+        print("Trades written to", trades_path)
+        return
+    if not args.ticker:
+        parser.error("a ticker or --batch FILE is required")
+
     short, long = MA_OPTIONS[args.option]
     df = download_data(args.ticker)
     if df.empty:
@@ -100,7 +209,8 @@ def main() -> None:
         print(round(avg_roi, 2))
     else:
         print("\nNo valid ROI calculation interval")
-    plot(df, golden, dead, short, long, args.ticker)
+    if not args.no_plot:
+        plot(df, golden, dead, short, long, args.ticker)
 
 if __name__ == "__main__":
     main()